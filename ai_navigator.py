@@ -23,16 +23,24 @@
 
 import sys
 import re
+import logging
 import os
+import atexit
+import queue
 import webbrowser
 import subprocess
+import shutil
 import sqlite3
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 import threading
 import time
+import functools
+import itertools
+from operator import itemgetter
+from collections import OrderedDict
 
 from PySide6.QtCore import (
     Qt,
@@ -41,6 +49,12 @@ from PySide6.QtCore import (
     QRect,
     QUrl,
     Signal,
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QEventLoop,
 )
 from PySide6.QtGui import (
     QPixmap,
@@ -48,7 +62,6 @@ from PySide6.QtGui import (
     QPen,
     QBrush,
     QColor,
-    QTransform,
     QPainterPath,
     QGuiApplication,
     QDesktopServices,
@@ -64,6 +77,7 @@ from PySide6.QtWidgets import (
     QTextEdit,
     QListWidget,
     QListWidgetItem,
+    QListView,
     QTreeWidget,
     QTreeWidgetItem,
     QSplitter,
@@ -71,14 +85,42 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QSizePolicy,
 )
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from bs4 import BeautifulSoup  # for OPML export parsing
+from lxml import html as lxml_html  # for OPML export parsing
+
+try:
+    import zstandard as zstd  # optional: compressed HTML storage
+except Exception:
+    zstd = None
 
 # Initializes storage/ and ensures archive_pages exists (same schema used below).
-from init_db import init_db_if_needed
+from init_db import ensure_archive_table, init_db_if_needed
+
+# Qt-free archive helpers, shared with navigator_rpc.py and the crawler.
+from archive_core import (
+    CAPSULE_BODY_CHARS,
+    READER_HTML_COLS,
+    READER_HTML_PREFIX_COLS,
+    SQL_ARCHIVE_INSERT,
+    build_context_capsule_for_snapshot,
+    build_global_weave_packet,
+    build_memory_weave_packet,
+    captured_row,
+    clean_for_capsule,
+    get_archive_conn,
+    html_to_snippet,
+    iso_now,
+    pack_html,
+    parse_html,
+    reader_html,
+    reader_html_prefix,
+    sanitize_html_for_reader,
+    tune_read_conn,
+)
 
 init_db_if_needed()
 
+log = logging.getLogger("ai_navigator")
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -97,112 +139,233 @@ K_WEAVE = 3  # Recover Memory Weave count
 # Archive DB helpers (archive_pages)
 # ---------------------------------------------------------------------------
 
-def ensure_archive_table(db_path: Path):
+def migrate_archive_html(db_path: Path, batch: int = 100) -> int:
     """
-    Make sure the archive_pages table exists (matches init_db.py).
-    Columns:
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        url TEXT,
-        title TEXT,
-        captured_at TEXT,
-        snippet TEXT,
-        html TEXT,
-        clean_html TEXT
+    Compress rows written before zstd storage existed. Meant for a daemon
+    thread: uses its own connection and commits every `batch` rows.
     """
+    if zstd is None:
+        return 0
+    ensure_archive_table(db_path)
     conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS archive_pages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            url TEXT,
-            title TEXT,
-            captured_at TEXT,
-            snippet TEXT,
-            html TEXT,
-            clean_html TEXT
-        );
-        """
-    )
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL: no fsync per batch commit
+    done = 0
     try:
-        cur.execute("ALTER TABLE archive_pages ADD COLUMN clean_html TEXT;")
-    except sqlite3.OperationalError:
-        pass
-    conn.commit()
-    conn.close()
+        while True:
+            rows = conn.execute(
+                """
+                SELECT id, clean_html, html FROM archive_pages
+                WHERE (html IS NOT NULL AND html_zstd IS NULL)
+                   OR (clean_html IS NOT NULL AND clean_html_zstd IS NULL)
+                LIMIT ?;
+                """,
+                (batch,),
+            ).fetchall()
+            if not rows:
+                break
+            with conn:
+                conn.executemany(
+                    """
+                    UPDATE archive_pages
+                    SET clean_html = ?, clean_html_zstd = ?, html = ?, html_zstd = ?
+                    WHERE id = ?;
+                    """,
+                    [(*pack_html(c), *pack_html(h), pid) for pid, c, h in rows],
+                )
+            done += len(rows)
+    finally:
+        conn.close()
+    return done
 
 
-def html_to_snippet(html: str, max_len: int = 500) -> str:
+_read_conns = threading.local()
+
+
+def _get_read_conn(db_path: Path, ensure_schema) -> sqlite3.Connection:
+    conns = getattr(_read_conns, "by_path", None)
+    if conns is None:
+        conns = _read_conns.by_path = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        ensure_schema(db_path)
+        conn = conns[db_path] = tune_read_conn(sqlite3.connect(db_path))
+    return conn
+
+
+def get_archive_read_conn(db_path: Path = DB_PATH) -> sqlite3.Connection:
     """
-    Tiny text extractor for preview/snippet:
-    - strips <script> and <style>
-    - strips other tags
-    - collapses whitespace
-    Returns first max_len chars.
+    Per-thread, reused read connection (QThreadPool workers keep theirs
+    across jobs, so the page cache stays warm). WAL lets these read while
+    get_archive_conn() writes.
     """
-    text = re.sub(r"<script.*?</script>", " ", html, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<style.*?</style>", " ", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    text = text.strip()
-    return text[:max_len]
+    return _get_read_conn(db_path, ensure_archive_table)
 
 
-def sanitize_html_for_reader(raw_html: str) -> str:
+class BatchWriter(threading.Thread):
     """
-    Reader Mode: preserves narrative, removes instrumentation.
-    We strip:
-      - <script>...</script>
-      - <iframe>...</iframe>
-      - preload / preconnect / dns-prefetch link tags
-      - inline JS event handlers like onclick="..."
+    Write-behind queue base.
+
+    Owns one persistent connection and drains tuples from `q`, committing
+    them with executemany(SQL, self._rows(batch)) in a single transaction
+    every BATCH rows or FLUSH_S seconds, whichever comes first.
+
+    Errors never stop the thread: an item whose _row() raises is logged and
+    skipped, and a batch whose insert fails is retried row by row so only
+    the offending rows are dropped.
     """
-    cleaned = re.sub(
-        r"<script.*?</script>", "", raw_html, flags=re.IGNORECASE | re.DOTALL
-    )
-    cleaned = re.sub(
-        r"<iframe.*?</iframe>", "", cleaned, flags=re.IGNORECASE | re.DOTALL
-    )
-    cleaned = re.sub(
-        r"<link[^>]+rel=[\"']?(preload|dns-prefetch|preconnect|modulepreload)[\"']?[^>]*>",
-        "",
-        cleaned,
-        flags=re.IGNORECASE,
-    )
-    cleaned = re.sub(
-        r"\son\w+\s*=\s*['\"].*?['\"]", "", cleaned, flags=re.IGNORECASE | re.DOTALL
-    )
-    return cleaned
 
+    BATCH = 32
+    FLUSH_S = 0.5
+    SQL = ""
 
-def save_archive_page(db_path: Path, url: str, title: str, html: str):
+    _STOP = object()
+
+    def __init__(self, db_path: Path, on_flushed=None):
+        super().__init__(name=type(self).__name__, daemon=True)
+        self.db_path = db_path
+        self.on_flushed = on_flushed
+        self.q = queue.Queue()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
+    def run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._safe_flush(batch)
+                break
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.FLUSH_S
+                batch.append(item)
+            if batch and (len(batch) >= self.BATCH or time.monotonic() >= deadline):
+                self._safe_flush(batch)
+                batch = []
+                deadline = None
+        self.conn.close()
+
+    def _row(self, item) -> tuple:
+        """Queued item -> SQL parameters. Subclasses do their CPU work here."""
+        return item
+
+    def _rows(self, batch) -> list:
+        rows = []
+        for item in batch:
+            try:
+                rows.append(self._row(item))
+            except Exception:
+                log.exception("%s: skipping unconvertible item %.120r", self.name, item)
+        return rows
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        rows = self._rows(batch)
+        if not rows:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(self.SQL, rows)
+        except sqlite3.Error:
+            log.exception("%s: batch insert failed, retrying %d rows singly", self.name, len(rows))
+            for row in rows:
+                try:
+                    with self.conn:
+                        self.conn.execute(self.SQL, row)
+                except sqlite3.Error:
+                    log.exception("%s: dropping row %.120r", self.name, row)
+        if self.on_flushed:
+            self.on_flushed()
+
+    def _safe_flush(self, batch):
+        try:
+            self._flush(batch)
+        except Exception:
+            log.exception("%s: flush failed, %d items lost", self.name, len(batch))
+
+    def close(self):
+        """Flush anything still queued and stop the thread."""
+        if self.is_alive():
+            self.q.put(self._STOP)
+            self.join()
+
+
+class ArchiveWriter(BatchWriter):
     """
-    Insert a captured page into archive_pages with timestamp + snippet.
-    Also stores a sanitized Reader Mode copy (clean_html).
+    Write-behind queue for archive_pages. Drains (url, title, captured_at,
+    html) tuples; the lxml parse, Reader Mode cleaning and zstd packing all
+    happen here, off the GUI thread.
     """
-    ensure_archive_table(db_path)
 
-    captured_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    snippet = html_to_snippet(html)
-    clean_html = sanitize_html_for_reader(html)
+    BATCH = 64
+    FLUSH_S = 0.25
+    SQL = SQL_ARCHIVE_INSERT
 
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO archive_pages (url, title, captured_at, snippet, html, clean_html)
-        VALUES (?, ?, ?, ?, ?, ?);
-        """,
-        (url, title, captured_at, snippet, html, clean_html),
-    )
-    conn.commit()
-    conn.close()
+    def __init__(self, db_path: Path, on_flushed=None):
+        ensure_archive_table(db_path)
+        super().__init__(db_path, on_flushed=on_flushed)
+
+    def _row(self, page) -> tuple:
+        return captured_row(*page)
+
+
+def _get_writer(writers: dict, cls, db_path: Path, on_flushed=None):
+    """Return the (lazily started) cls writer for db_path."""
+    writer = writers.get(db_path)
+    if writer is None:
+        writer = cls(db_path, on_flushed=on_flushed)
+        writer.start()
+        atexit.register(writer.close)
+        writers[db_path] = writer
+    elif on_flushed is not None:
+        writer.on_flushed = on_flushed
+    return writer
+
+
+_archive_writers: dict = {}
+
+
+def get_archive_writer(db_path: Path, on_flushed=None) -> ArchiveWriter:
+    return _get_writer(_archive_writers, ArchiveWriter, db_path, on_flushed)
+
+
+def save_archive_page(db_path: Path, url: str, title: str, html: str):
+    """
+    Queue a captured page for archive_pages (timestamp + snippet + sanitized
+    Reader Mode copy); ArchiveWriter commits it in the next batch.
+    """
+    get_archive_writer(db_path).q.put((url, title, iso_now(), html))
 
 
 # ---------------------------------------------------------------------------
 # Memory DB helpers (memory.db)
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=4096)
+def _memory_domain(url) -> str:
+    return urlsplit(url or "").netloc
+
+
+def _memory_session_hour(ts) -> str | None:
+    """Memory Pane session bucket ("YYYY-MM-DD HH:00") for an ISO timestamp."""
+    if not ts:
+        return None
+    try:
+        return datetime.fromisoformat(ts.replace("Z", "")).strftime("%Y-%m-%d %H:00")
+    except Exception:
+        return "Unknown Session"
+
+
 def ensure_memory_table(db_path: Path):
     """
     Simple memory table for the Memory Pane:
@@ -210,9 +373,15 @@ def ensure_memory_table(db_path: Path):
         url TEXT,
         title TEXT,
         timestamp TEXT,
-        raw_html TEXT
+        raw_html TEXT,
+        raw_html_zstd BLOB,  -- zstd-compressed UTF-8 (raw_html is NULL then)
+        domain TEXT,         -- urlsplit(url).netloc, stored at ingest
+        session_hour TEXT    -- _memory_session_hour(timestamp)
     """
     conn = sqlite3.connect(db_path)
+    # WAL is persistent; set it at creation so Memory Pane reads never block
+    # on (or wait for) MemoryWriter commits.
+    conn.execute("PRAGMA journal_mode=WAL")
     cur = conn.cursor()
     cur.execute(
         """
@@ -225,85 +394,132 @@ def ensure_memory_table(db_path: Path):
         );
         """
     )
+    cols = {r[1] for r in cur.execute("PRAGMA table_info(memory_entries);")}
+    if "raw_html_zstd" not in cols:
+        cur.execute("ALTER TABLE memory_entries ADD COLUMN raw_html_zstd BLOB;")
+    if "session_hour" not in cols:
+        cur.execute("ALTER TABLE memory_entries ADD COLUMN domain TEXT;")
+        cur.execute("ALTER TABLE memory_entries ADD COLUMN session_hour TEXT;")
+        conn.create_function("memory_domain", 1, _memory_domain, deterministic=True)
+        conn.create_function(
+            "memory_session_hour", 1, _memory_session_hour, deterministic=True
+        )
+        cur.execute(
+            "UPDATE memory_entries SET domain = memory_domain(url), "
+            "session_hour = memory_session_hour(timestamp);"
+        )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_memory_session "
+        "ON memory_entries (session_hour DESC, domain);"
+    )
     conn.commit()
     conn.close()
 
 
+class MemoryWriter(BatchWriter):
+    """
+    Write-behind queue for memory.db.
+
+    Drains (url, title, ts, raw_html) tuples in batches (see BatchWriter).
+    When zstandard is installed the HTML is compressed here, off the GUI
+    thread.
+    """
+
+    SQL = """
+        INSERT INTO memory_entries
+            (url, title, timestamp, raw_html, raw_html_zstd, domain, session_hour)
+        VALUES (?, ?, ?, ?, ?, ?, ?);
+    """
+
+    def __init__(self, db_path: Path, on_flushed=None):
+        ensure_memory_table(db_path)
+        super().__init__(db_path, on_flushed=on_flushed)
+        self._zc = zstd.ZstdCompressor(level=1) if zstd else None
+
+    def _row(self, entry) -> tuple:
+        url, title, ts, html = entry
+        zc = self._zc
+        return (
+            url,
+            title,
+            ts,
+            None if zc else html,
+            zc.compress((html or "").encode("utf-8")) if zc else None,
+            _memory_domain(url),
+            _memory_session_hour(ts),
+        )
+
+
+_memory_writers: dict = {}
+
+
+def get_memory_writer(db_path: Path, on_flushed=None) -> MemoryWriter:
+    return _get_writer(_memory_writers, MemoryWriter, db_path, on_flushed)
+
+
 def log_memory_entry(db_path: Path, url: str, title: str, raw_html: str):
-    ensure_memory_table(db_path)
-    ts = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO memory_entries (url, title, timestamp, raw_html)
-        VALUES (?, ?, ?, ?);
-        """,
-        (url, title, ts, raw_html),
-    )
-    conn.commit()
-    conn.close()
+    """Queue a memory row; MemoryWriter commits it in the next batch."""
+    ts = iso_now()
+    get_memory_writer(db_path).q.put((url, title, ts, raw_html))
 
 
-def load_memory_entries(db_path: Path, limit: int = 200):
-    ensure_memory_table(db_path)
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
+def get_memory_read_conn(db_path: Path = MEMORY_DB_PATH) -> sqlite3.Connection:
+    """Per-thread memory.db reader, like get_archive_read_conn()."""
+    return _get_read_conn(db_path, ensure_memory_table)
+
+
+def load_memory_entries(db_path: Path, limit: int = 200, since_id: int = 0):
+    """
+    The newest `limit` entries with id > since_id (and a timestamp) as
+    (session, domain, id, title, url) rows, already in Memory Tree order:
+    session DESC, domain ASC, newest first within a domain.
+    """
+    cur = get_memory_read_conn(db_path).execute(
         """
-        SELECT id, url, title, timestamp
-        FROM memory_entries
-        ORDER BY id DESC
-        LIMIT ?;
+        SELECT COALESCE(session_hour, 'Unknown Session') AS session,
+               COALESCE(NULLIF(domain, ''), 'unknown-domain') AS dom,
+               id, title, url
+        FROM (
+            SELECT * FROM memory_entries
+            WHERE id > ?
+            ORDER BY id DESC
+            LIMIT ?
+        )
+        WHERE timestamp IS NOT NULL AND timestamp <> ''
+        ORDER BY session DESC, dom ASC, id DESC;
         """,
-        (limit,),
+        (since_id, limit),
     )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    return cur.fetchall()
 
 
 # ---------------------------------------------------------------------------
-# Clipboard helper (Qt + X11 fallbacks)
+# Clipboard helper (Qt)
 # ---------------------------------------------------------------------------
 
 def copy_to_clipboard(text: str) -> bool:
     """
-    Try Qt clipboard (Clipboard + Selection), then fall back to xclip/xsel on X11.
-    Returns True if we *believe* it landed on a clipboard.
+    Put text on the Qt clipboard (Clipboard + Selection). Qt talks to
+    X11/Wayland natively, so there is no xclip/xsel subprocess fallback.
+    Returns False only if Qt has no clipboard to give us.
+
+    Callers open the browser right after this, so pending clipboard events
+    are processed before returning: otherwise the new owner may not be
+    announced yet when focus moves and the previous contents get pasted.
     """
-    ok = False
     try:
         cb = QGuiApplication.clipboard()
-        if cb is not None:
-            cb.setText(text or "")
-            try:
-                cb.setText(text or "", mode=QClipboard.Mode.Selection)
-            except Exception:
-                pass
-            ok = True
-    except Exception:
-        ok = False
-
-    if ok:
+        if cb is None:
+            return False
+        # setText builds the QMimeData on the C++ side; a Python-owned
+        # QMimeData handed to setMimeData crashes PySide at shutdown.
+        cb.setText(text or "", QClipboard.Mode.Clipboard)
+        if cb.supportsSelection():
+            cb.setText(text or "", QClipboard.Mode.Selection)
+        QGuiApplication.processEvents(QEventLoop.AllEvents, 10)
         return True
-
-    for cmd in (
-        ["xclip", "-selection", "clipboard"],
-        ["xsel", "--clipboard", "--input"],
-    ):
-        try:
-            p = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            p.communicate(input=(text or "").encode("utf-8"), timeout=1.5)
-            return True
-        except Exception:
-            continue
-    return False
+    except Exception:
+        return False
 
 
 # ---------------------------------------------------------------------------
@@ -316,8 +532,11 @@ class VPNController:
       openvpn-client@ainav.service
     """
 
+    PROBE_TTL = 1.0  # seconds; the status light polls every 1.5 s
+
     def __init__(self, unit_name="openvpn-client@ainav"):
         self.unit = unit_name
+        self._cache = (0.0, None)  # (monotonic ts, (active, has_tun))
 
     def _run(self, *args, check=False):
         return subprocess.run(
@@ -328,46 +547,64 @@ class VPNController:
             check=check,
         )
 
+    def _probe(self) -> tuple:
+        ts, status = self._cache
+        now = time.monotonic()
+        if status is None or now - ts > self.PROBE_TTL:
+            active = self._run("systemctl", "is-active", "--quiet", self.unit).returncode == 0
+            status = (active, self._tun_present())
+            self._cache = (now, status)
+        return status
+
+    def _invalidate(self):
+        self._cache = (0.0, None)
+
+    def _tun_present(self) -> bool:
+        # Interfaces are listed in sysfs; no need to fork `ip` for them.
+        try:
+            return any(name.startswith("tun") for name in os.listdir("/sys/class/net"))
+        except OSError:
+            pass
+        # One `ip -o link` call: "5: tun0: <POINTOPOINT,...> mtu 1500 ..."
+        r = self._run("ip", "-o", "link", "show")
+        for line in r.stdout.splitlines():
+            parts = line.split(":", 2)
+            if len(parts) > 1 and parts[1].strip().startswith("tun"):
+                return True
+        return False
+
+    def status(self) -> tuple:
+        """(active, has_tun), cached for PROBE_TTL seconds."""
+        return self._probe()
+
     def is_active(self) -> bool:
-        r = self._run("systemctl", "is-active", "--quiet", self.unit)
-        return r.returncode == 0
+        return self._probe()[0]
 
     def start(self) -> bool:
         self._run("systemctl", "start", self.unit)
+        self._invalidate()
         return self.is_active()
 
     def stop(self) -> bool:
         self._run("systemctl", "stop", self.unit)
+        self._invalidate()
         return not self.is_active()
 
-    def _default_route_iface(self) -> str | None:
-        r = self._run("ip", "route")
-        for line in r.stdout.splitlines():
-            if line.startswith("default "):
-                parts = line.split()
-                if "dev" in parts:
-                    try:
-                        idx = parts.index("dev")
-                        return parts[idx + 1]
-                    except Exception:
-                        pass
-        return None
-
     def has_tun(self) -> bool:
-        iface = self._default_route_iface()
-        if iface and iface.startswith("tun"):
-            return True
-        r = self._run("ip", "addr")
-        return " tun0:" in r.stdout or " tun" in r.stdout
+        return self._probe()[1]
 
     def ensure_connected(self, timeout_s=20) -> bool:
-        if self.is_active() and self.has_tun():
+        if all(self.status()):
             return True
         self.start()
-        t0 = time.time()
-        while time.time() - t0 < timeout_s:
-            if self.is_active() and self.has_tun():
-                return True
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            # Waiting on the tun device is a sysfs listing; systemctl is only
+            # forked once it exists.
+            if self._tun_present():
+                self._invalidate()
+                if all(self.status()):
+                    return True
             time.sleep(0.5)
         return False
 
@@ -376,43 +613,69 @@ class VPNController:
 # OPML export helpers
 # ---------------------------------------------------------------------------
 
+_SLUG_WS_RE = re.compile(r"\s+")
+_SLUG_DROP_RE = re.compile(r"[^A-Za-z0-9\-_]+")
+
+
 def _slug(s: str) -> str:
-    s = re.sub(r"\s+", "-", (s or "").strip())
-    s = re.sub(r"[^A-Za-z0-9\-_]+", "", s)
+    s = _SLUG_WS_RE.sub("-", (s or "").strip())
+    s = _SLUG_DROP_RE.sub("", s)
     return s or "page"
 
 
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+# Characters XML 1.0 cannot carry at all (escaping does not help).
+_XML_ILLEGAL_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
 def _html_to_opml(html: str, title: str) -> str:
-    soup = BeautifulSoup(html or "", "lxml")
-    doc_title = (title or (soup.title.string if soup.title else "")) or "Untitled"
+    root = parse_html(html)
+    if root is None:
+        root = lxml_html.document_fromstring("<html></html>")
+    doc_title = (title or root.findtext(".//title") or "").strip() or "Untitled"
     nodes = []
-    for tag in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-        level = int(tag.name[1])
-        text = tag.get_text(" ", strip=True)
+    for el in root.iter(*_HEADING_TAGS):
+        text = " ".join(el.text_content().split())
         if text:
-            nodes.append((level, text))
-
-    out = [
-        '<?xml version="1.0"?>',
-        '<opml version="2.0"><head>',
-        f"<title>{doc_title}</title>",
-        "</head><body>",
-    ]
+            nodes.append((int(el.tag[1]), text))
+
+    # TreeBuilder + the C serializer escape titles/headings (&, <, ") for us.
+    tb = ET.TreeBuilder()
+    tb.start("opml", {"version": "2.0"})
+    tb.start("head", {})
+    tb.start("title", {})
+    tb.data(_XML_ILLEGAL_RE.sub("", doc_title))
+    tb.end("title")
+    tb.end("head")
+    tb.start("body", {})
 
     stack = [0]
     for level, text in nodes:
-        while stack and level <= stack[-1]:
-            out.append("</outline>")
+        while level <= stack[-1]:
+            tb.end("outline")
             stack.pop()
-        out.append(f'<outline text="{text}">')
+        tb.start("outline", {"text": _XML_ILLEGAL_RE.sub("", text)})
         stack.append(level)
 
     while len(stack) > 1:
-        out.append("</outline>")
+        tb.end("outline")
         stack.pop()
 
-    out.append("</body></opml>")
-    return "\n".join(out)
+    tb.end("body")
+    root = tb.end("opml")
+    ET.indent(root)
+    return ET.tostring(root, encoding="unicode", xml_declaration=True)
+
+
+def save_outline_opml(html: str, title: str) -> Path:
+    """Write the page's heading outline to ./archives/opml/<slug>-<ts>.opml."""
+    opml = _html_to_opml(html, title)
+    outdir = Path.cwd() / "archives" / "opml"
+    outdir.mkdir(parents=True, exist_ok=True)
+    ts = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    outpath = outdir / f"{_slug(title)}-{ts}.opml"
+    outpath.write_text(opml, encoding="utf-8")
+    return outpath
 
 
 # ---------------------------------------------------------------------------
@@ -424,6 +687,8 @@ class ThrobberWidget(QWidget):
     Rotating "A" throbber for AI Navigator.
     """
 
+    STEP = 15  # degrees per tick
+
     def __init__(self, parent=None, size=24):
         super().__init__(parent)
         self.setFixedSize(QSize(size, size))
@@ -431,7 +696,9 @@ class ThrobberWidget(QWidget):
 
         self.timer = QTimer(self)
         self.timer.setInterval(50)
+        self.timer.setTimerType(Qt.CoarseTimer)
         self.timer.timeout.connect(self._tick)
+        self._want_spin = False
 
         self.base_pixmap = self._make_base_pixmap(size)
 
@@ -473,34 +740,42 @@ class ThrobberWidget(QWidget):
         return pm
 
     def _tick(self):
-        self.angle = (self.angle + 15) % 360
+        self.angle = (self.angle + self.STEP) % 360
         self.update()
 
     def start(self):
-        if not self.timer.isActive():
+        self._want_spin = True
+        if self.isVisible() and not self.timer.isActive():
             self.timer.start()
 
     def stop(self):
-        if self.timer.isActive():
-            self.timer.stop()
+        self._want_spin = False
+        self.timer.stop()
+
+    # Only tick while visible: start()/stop() record the wish, show/hide
+    # apply it, so a hidden throbber never wakes the CPU at 20 Hz.
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        if self._want_spin:
+            self.timer.start()
+        super().showEvent(event)
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-
         cx = self.width() / 2.0
         cy = self.height() / 2.0
-
-        t = QTransform()
-        t.translate(cx, cy)
-        t.rotate(self.angle)
-        t.translate(-cx, -cy)
-
-        rotated = self.base_pixmap.transformed(t, Qt.SmoothTransformation)
-
-        x = (self.width() - rotated.width()) / 2.0
-        y = (self.height() - rotated.height()) / 2.0
-        painter.drawPixmap(int(x), int(y), rotated)
+        painter.translate(cx, cy)
+        painter.rotate(self.angle)
+        painter.translate(-cx, -cy)
+
+        pm = self.base_pixmap
+        x = (self.width() - pm.width()) / 2.0
+        y = (self.height() - pm.height()) / 2.0
+        painter.drawPixmap(int(x), int(y), pm)
         painter.end()
 
 
@@ -525,6 +800,9 @@ class BrowserPane(QWidget):
         self.on_archive_request = on_archive_request
         self.on_memory_log = on_memory_log
 
+        # Imported here so plain module imports (RPC, scripts) don't pull in Chromium.
+        from PySide6.QtWebEngineWidgets import QWebEngineView
+
         self.view = QWebEngineView()
 
         self.url_bar = QLineEdit()
@@ -636,6 +914,7 @@ class BrowserPane(QWidget):
         self.view.loadFinished.connect(self._on_load_finished)
 
         self.vpn_button.toggled.connect(self._toggle_vpn)
+        self._vpn_probe_pending = False
         self.vpn_timer = QTimer(self)
         self.vpn_timer.timeout.connect(self._refresh_vpn_status)
         self.vpn_timer.start(1500)
@@ -653,13 +932,27 @@ class BrowserPane(QWidget):
             self._refresh_vpn_status()
 
     def _bring_vpn_up(self):
+        # Runs on a plain thread: the status light catches up on its next poll.
         ok = self.vpn.ensure_connected(timeout_s=25)
         self.status_label.setText("VPN connected" if ok else "VPN connection failed")
-        self._refresh_vpn_status()
 
     def _refresh_vpn_status(self):
-        active = self.vpn.is_active()
-        has_tun = self.vpn.has_tun()
+        # systemctl is forked on a pool thread; the GUI thread only repaints.
+        if self._vpn_probe_pending:
+            return
+        self._vpn_probe_pending = True
+        run_in_pool(
+            self.vpn.status,
+            on_done=self._show_vpn_status,
+            on_error=self._vpn_probe_failed,
+        )
+
+    def _vpn_probe_failed(self, _msg: str):
+        self._vpn_probe_pending = False
+
+    def _show_vpn_status(self, status: tuple):
+        self._vpn_probe_pending = False
+        active, has_tun = status
         color = "green" if (active and has_tun) else ("orange" if active else "red")
         self.vpn_status.setStyleSheet(f"color: {color}; padding-left:6px;")
         self.vpn_status.setToolTip(
@@ -676,7 +969,7 @@ class BrowserPane(QWidget):
             url = "https://" + url
 
         if self.require_vpn:
-            if not (self.vpn.is_active() and self.vpn.has_tun()):
+            if not all(self.vpn.status()):
                 self.status_label.setText("Waiting for VPN…")
                 threading.Thread(target=self._bring_vpn_up, daemon=True).start()
                 return
@@ -739,27 +1032,234 @@ class BrowserPane(QWidget):
         """Export the visible page's heading outline to ./archives/opml/*.opml"""
 
         def _on_html(html: str):
-            try:
-                title = self.view.title() or ""
-                opml = _html_to_opml(html, title)
-                outdir = Path.cwd() / "archives" / "opml"
-                outdir.mkdir(parents=True, exist_ok=True)
-                ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-                name = f"{_slug(title)}-{ts}.opml"
-                outpath = outdir / name
-                outpath.write_text(opml, encoding="utf-8")
-                self.status_label.setText(f"OPML saved → {outpath}")
-                QMessageBox.information(self, "OPML export", f"Saved:\n{outpath}")
-            except Exception as e:
-                QMessageBox.critical(self, "OPML export failed", str(e))
+            # Parse + write on a pool thread; the page may be large.
+            run_in_pool(
+                save_outline_opml,
+                html,
+                self.view.title() or "",
+                on_done=self._outline_opml_saved,
+                on_error=lambda msg: QMessageBox.critical(self, "OPML export failed", msg),
+            )
 
         self.view.page().toHtml(_on_html)
 
+    def _outline_opml_saved(self, outpath: Path):
+        self.status_label.setText(f"OPML saved → {outpath}")
+        QMessageBox.information(self, "OPML export", f"Saved:\n{outpath}")
+
+
+# ---------------------------------------------------------------------------
+# Background jobs (QThreadPool)
+# ---------------------------------------------------------------------------
+
+class _JobSignals(QObject):
+    done = Signal(object)
+    failed = Signal(str)
+
+
+class _Job(QRunnable):
+    def __init__(self, fn, args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = _JobSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.done.emit(result)
+
+
+_pending_jobs = set()  # keeps each job's signal object alive until delivery
+
+
+def run_in_pool(fn, *args, on_done=None, on_error=None):
+    """
+    Run fn(*args) on the global QThreadPool. on_done(result) / on_error(msg)
+    are delivered on the GUI thread. fn must not touch widgets or share a
+    sqlite3 connection with the GUI thread.
+    """
+    job = _Job(fn, args)
+    sig = job.signals
+    _pending_jobs.add(sig)
+    sig.done.connect(lambda _r: _pending_jobs.discard(sig))
+    sig.failed.connect(lambda _m: _pending_jobs.discard(sig))
+    if on_done is not None:
+        sig.done.connect(on_done)
+    if on_error is not None:
+        sig.failed.connect(on_error)
+    QThreadPool.globalInstance().start(job)
+
 
 # ---------------------------------------------------------------------------
 # Results Pane
 # ---------------------------------------------------------------------------
 
+# SQL kept as module constants so sqlite3's per-connection statement cache
+# (keyed by SQL text) hits on every call.
+_SQL_ARCHIVE_COUNT = "SELECT COUNT(*) FROM archive_pages;"
+_SQL_ARCHIVE_LIST = """
+    SELECT id, title, captured_at
+    FROM archive_pages
+    ORDER BY captured_at DESC
+    LIMIT ? OFFSET ?;
+"""
+_SQL_ARCHIVE_DETAIL = "SELECT url, snippet FROM archive_pages WHERE id = ?;"
+_SQL_READER_HTML = f"SELECT {READER_HTML_COLS} FROM archive_pages WHERE id = ?;"
+_SQL_READER_SNAPSHOT = f"SELECT url, {READER_HTML_COLS} FROM archive_pages WHERE id = ?;"
+_SQL_CAPSULE_ROW = f"""
+    SELECT title, url, captured_at, snippet, {READER_HTML_PREFIX_COLS}
+    FROM archive_pages
+    WHERE id = ?1;
+"""
+
+
+def _load_reader_snapshot(db_path: Path, page_id: int):
+    """(url, reader html) for an archive row, or None. Safe on any thread."""
+    row = get_archive_read_conn(db_path).execute(
+        _SQL_READER_SNAPSHOT, (page_id,)
+    ).fetchone()
+    if not row:
+        return None
+    return row[0], reader_html(*row[1:])
+
+
+def _build_snapshot_capsule(db_path: Path, page_id: int):
+    """Recover-to-ChatGPT capsule for an archive row, or None if it's gone."""
+    conn = get_archive_read_conn(db_path)
+    # The capsule keeps CAPSULE_BODY_CHARS of cleaned body; read twice that
+    # so whitespace collapsed by clean_for_capsule can't leave it short.
+    limit = 2 * CAPSULE_BODY_CHARS
+    row = conn.execute(_SQL_CAPSULE_ROW, (page_id, limit)).fetchone()
+    if not row:
+        return None
+    title, url, captured_at, snippet = row[:4]
+    body = reader_html_prefix(conn, page_id, *row[4:], limit)
+    if (
+        body
+        and len(body) >= limit
+        and len(clean_for_capsule(body)) <= CAPSULE_BODY_CHARS + 2
+    ):
+        # Mostly whitespace up front: fall back to the whole page.
+        full = conn.execute(_SQL_READER_HTML, (page_id,)).fetchone()
+        if full:
+            body = reader_html(*full)
+    return build_context_capsule_for_snapshot(
+        title=title or url or "(untitled)",
+        url=url or "about:blank",
+        captured_at=captured_at or "",
+        snippet=snippet or "",
+        body=body or "",
+        hard_cap_chars=6500,
+    )
+
+
+def _build_weave_capsule(db_path: Path, page_id: int) -> str:
+    conn = get_archive_read_conn(db_path)
+    return build_memory_weave_packet(conn, page_id, k=K_WEAVE, hard_cap_chars=7000)
+
+
+def _open_with_qt(target: str) -> bool:
+    return QDesktopServices.openUrl(QUrl(target))
+
+
+def _open_with_xdg(target: str) -> bool:
+    subprocess.Popen(
+        ["xdg-open", target],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return True
+
+
+_url_opener = None  # first opener in the cascade that worked; reused after
+
+
+def _open_external_url(target: str) -> bool:
+    """
+    Qt, then webbrowser, then xdg-open (only if installed). Once one of them
+    succeeds it is remembered, so later calls skip the ones that failed.
+    """
+    global _url_opener
+    if _url_opener is not None:
+        try:
+            if _url_opener(target):
+                return True
+        except Exception:
+            pass
+        _url_opener = None
+    openers = [_open_with_qt, webbrowser.open_new_tab]
+    if shutil.which("xdg-open"):
+        openers.append(_open_with_xdg)
+    for opener in openers:
+        try:
+            if opener(target):
+                _url_opener = opener
+                return True
+        except Exception:
+            continue
+    return False
+
+
+def _open_chatgpt():
+    _open_external_url("https://chatgpt.com/")
+
+
+class ArchiveListModel(QAbstractListModel):
+    """
+    Virtual list over archive_pages: rows are fetched in WINDOW-sized pages
+    as the view asks for them, and kept in a small LRU cache.
+    """
+
+    WINDOW = 50
+    CACHE_ROWS = 500
+
+    def __init__(self, conn: sqlite3.Connection, parent=None):
+        super().__init__(parent)
+        self.conn = conn
+        self._count = 0
+        self._rows = OrderedDict()  # row -> (id, title, captured_at)
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self._rows.clear()
+        self._count = self.conn.execute(_SQL_ARCHIVE_COUNT).fetchone()[0]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def _row(self, r: int):
+        row = self._rows.get(r)
+        if row is not None:
+            self._rows.move_to_end(r)
+            return row
+        start = r - r % self.WINDOW
+        cur = self.conn.execute(_SQL_ARCHIVE_LIST, (self.WINDOW, start))
+        for i, fetched in enumerate(cur, start):
+            self._rows[i] = fetched
+        while len(self._rows) > self.CACHE_ROWS:
+            self._rows.popitem(last=False)
+        return self._rows.get(r)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._row(index.row())
+        if row is None:
+            return None
+        page_id, title, captured_at = row
+        if role == Qt.DisplayRole:
+            return f"{title}    ({captured_at})"
+        if role == Qt.UserRole:
+            return page_id
+        return None
+
+
 class ResultsPane(QWidget):
     """
     Snapshot list pane.
@@ -772,8 +1272,11 @@ class ResultsPane(QWidget):
 
         self.db_path = db_path
         self.conn = None
+        self._detail_cur = None
+        self.archive_model = None
 
-        self.archive_list = QListWidget()
+        self.archive_list = QListView()
+        self.archive_list.setUniformItemSizes(True)
         self.details_list = QListWidget()
 
         self.recover_button = QPushButton("Recover")
@@ -826,7 +1329,6 @@ class ResultsPane(QWidget):
 
         self.setLayout(layout)
 
-        self.archive_list.currentItemChanged.connect(self._populate_details_for_archive)
         self.recover_button.clicked.connect(self._recover_selected)
         self.recover_chat_button.clicked.connect(self._recover_to_chatgpt_selected)
         self.recover_weave_button.clicked.connect(self._recover_memory_weave_selected)
@@ -836,40 +1338,40 @@ class ResultsPane(QWidget):
 
     def _ensure_connection(self):
         if self.conn is None:
-            ensure_archive_table(self.db_path)
-            self.conn = sqlite3.connect(self.db_path)
+            # Shared with every other GUI-thread reader of this db.
+            self.conn = get_archive_read_conn(self.db_path)
+            self._detail_cur = self.conn.cursor()
 
     def _populate_archive_list(self):
-        self.archive_list.clear()
         if self.conn is None:
             return
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT id, title, captured_at
-            FROM archive_pages
-            ORDER BY captured_at DESC
-            LIMIT 200;
-            """
-        )
-        for page_id, title, captured_at in cur.fetchall():
-            label = f"{title}    ({captured_at})"
-            item = QListWidgetItem(label)
-            item.setData(Qt.UserRole, page_id)
-            self.archive_list.addItem(item)
+        if self.archive_model is None:
+            self.archive_model = ArchiveListModel(self.conn, self)
+            self.archive_list.setModel(self.archive_model)
+            self.archive_list.selectionModel().currentChanged.connect(
+                self._populate_details_for_archive
+            )
+        else:
+            self.archive_model.reload()
+        self.details_list.clear()
+
+    def _selected_page_id(self):
+        index = self.archive_list.currentIndex()
+        if not index.isValid():
+            return None
+        return index.data(Qt.UserRole)
 
     def _populate_details_for_archive(
-        self, current: QListWidgetItem, previous: QListWidgetItem
+        self, current: QModelIndex, previous: QModelIndex
     ):
         self.details_list.clear()
-        if self.conn is None or current is None:
+        if self.conn is None or not current.isValid():
             return
         page_id = current.data(Qt.UserRole)
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT url, snippet FROM archive_pages WHERE id = ?;",
-            (page_id,),
-        )
+        if page_id is None:
+            return
+        cur = self._detail_cur
+        cur.execute(_SQL_ARCHIVE_DETAIL, (page_id,))
         row = cur.fetchone()
         if not row:
             return
@@ -877,90 +1379,74 @@ class ResultsPane(QWidget):
         preview_text = f"{url}\n\n{snippet}"
         self.details_list.addItem(QListWidgetItem(preview_text))
 
+    # Row reads and capsule builds run on the thread pool (on that worker's
+    # read connection); the button stays disabled until the result arrives.
+
     def _recover_selected(self):
         if self.conn is None:
             QMessageBox.warning(self, "No DB", "Database not available.")
             return
-        current_item = self.archive_list.currentItem()
-        if current_item is None:
+        page_id = self._selected_page_id()
+        if page_id is None:
             QMessageBox.information(
                 self, "No selection", "Select an archived page first."
             )
             return
-        page_id = current_item.data(Qt.UserRole)
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT url, COALESCE(clean_html, html)
-            FROM archive_pages
-            WHERE id = ?;
-            """,
-            (page_id,),
+        self.recover_button.setEnabled(False)
+        run_in_pool(
+            _load_reader_snapshot,
+            self.db_path,
+            page_id,
+            on_done=self._recovered_ready,
+            on_error=self._recover_failed,
         )
-        row = cur.fetchone()
-        if not row:
+
+    def _recovered_ready(self, result):
+        self.recover_button.setEnabled(True)
+        if result is None:
             QMessageBox.warning(
                 self,
                 "Not found",
                 "That archived page no longer exists in the database.",
             )
             return
-        url, html_for_reader = row
+        url, html_for_reader = result
         self.recoveredPage.emit(html_for_reader, url)
 
-    def _recover_to_chatgpt_selected(self):
-        try:
-            if self.conn is None:
-                QMessageBox.warning(self, "No DB", "Database not available.")
-                return
-            item = self.archive_list.currentItem()
-            if item is None:
-                QMessageBox.information(
-                    self, "No selection", "Select an archived page first."
-                )
-                return
+    def _recover_failed(self, msg: str):
+        self.recover_button.setEnabled(True)
+        QMessageBox.critical(self, "Recover failed", msg)
 
-            page_id = item.data(Qt.UserRole)
-            cur = self.conn.cursor()
-            cur.execute(
-                """
-                SELECT title, url, captured_at, snippet, COALESCE(clean_html, html)
-                FROM archive_pages
-                WHERE id = ?;
-                """,
-                (page_id,),
+    def _recover_to_chatgpt_selected(self):
+        if self.conn is None:
+            QMessageBox.warning(self, "No DB", "Database not available.")
+            return
+        page_id = self._selected_page_id()
+        if page_id is None:
+            QMessageBox.information(
+                self, "No selection", "Select an archived page first."
             )
-            row = cur.fetchone()
-            if not row:
+            return
+        self.recover_chat_button.setEnabled(False)
+        run_in_pool(
+            _build_snapshot_capsule,
+            self.db_path,
+            page_id,
+            on_done=self._chatgpt_capsule_ready,
+            on_error=self._chatgpt_capsule_failed,
+        )
+
+    def _chatgpt_capsule_ready(self, capsule):
+        self.recover_chat_button.setEnabled(True)
+        try:
+            if capsule is None:
                 QMessageBox.warning(
                     self, "Not found", "That archived page no longer exists."
                 )
                 return
 
-            title, url, captured_at, snippet, body = row
-            capsule = build_context_capsule_for_snapshot(
-                title=title or url or "(untitled)",
-                url=url or "about:blank",
-                captured_at=captured_at or "",
-                snippet=snippet or "",
-                body=body or "",
-                hard_cap_chars=6500,
-            )
-
             copied = copy_to_clipboard(capsule)
-
-            target = "https://chatgpt.com/"
-            opened = QDesktopServices.openUrl(QUrl(target))
-            if not opened:
-                if not webbrowser.open_new_tab(target):
-                    try:
-                        subprocess.Popen(
-                            ["xdg-open", target],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL,
-                        )
-                    except Exception:
-                        pass
+            _open_chatgpt()
 
             if copied:
                 QMessageBox.information(
@@ -974,44 +1460,39 @@ class ResultsPane(QWidget):
                     self,
                     "Clipboard problem",
                     "Couldn't access the system clipboard.\n\n"
-                    "Tip: install xclip or xsel (Linux) for a reliable fallback,\n"
-                    "or just paste from the last successful copy if it's still there.",
+                    "Tip: paste from the last successful copy if it's still there.",
                 )
         except Exception as e:
             QMessageBox.critical(self, "Recover to ChatGPT failed", str(e))
 
-    def _recover_memory_weave_selected(self):
-        try:
-            if self.conn is None:
-                QMessageBox.warning(self, "No DB", "Database not available.")
-                return
-            item = self.archive_list.currentItem()
-            if item is None:
-                QMessageBox.information(
-                    self, "No selection", "Select an archived page first."
-                )
-                return
+    def _chatgpt_capsule_failed(self, msg: str):
+        self.recover_chat_button.setEnabled(True)
+        QMessageBox.critical(self, "Recover to ChatGPT failed", msg)
 
-            page_id = item.data(Qt.UserRole)
-
-            capsule = build_memory_weave_packet(
-                self.conn, page_id, k=K_WEAVE, hard_cap_chars=7000
+    def _recover_memory_weave_selected(self):
+        if self.conn is None:
+            QMessageBox.warning(self, "No DB", "Database not available.")
+            return
+        page_id = self._selected_page_id()
+        if page_id is None:
+            QMessageBox.information(
+                self, "No selection", "Select an archived page first."
             )
+            return
+        self.recover_weave_button.setEnabled(False)
+        run_in_pool(
+            _build_weave_capsule,
+            self.db_path,
+            page_id,
+            on_done=self._weave_ready,
+            on_error=self._weave_failed,
+        )
 
+    def _weave_ready(self, capsule: str):
+        self.recover_weave_button.setEnabled(True)
+        try:
             copied = copy_to_clipboard(capsule)
-
-            target = "https://chatgpt.com/"
-            opened = QDesktopServices.openUrl(QUrl(target))
-            if not opened:
-                if not webbrowser.open_new_tab(target):
-                    try:
-                        subprocess.Popen(
-                            ["xdg-open", target],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL,
-                        )
-                    except Exception:
-                        pass
+            _open_chatgpt()
 
             if copied:
                 QMessageBox.information(
@@ -1024,12 +1505,15 @@ class ResultsPane(QWidget):
                 QMessageBox.warning(
                     self,
                     "Clipboard problem",
-                    "Couldn't access the system clipboard.\n\n"
-                    "Tip: install xclip or xsel (Linux) for a reliable fallback.",
+                    "Couldn't access the system clipboard.",
                 )
         except Exception as e:
             QMessageBox.critical(self, "Recover Memory Weave failed", str(e))
 
+    def _weave_failed(self, msg: str):
+        self.recover_weave_button.setEnabled(True)
+        QMessageBox.critical(self, "Recover Memory Weave failed", msg)
+
     def refresh_all(self):
         if self.conn is None:
             self._ensure_connection()
@@ -1037,180 +1521,190 @@ class ResultsPane(QWidget):
 
 
 # ---------------------------------------------------------------------------
-# Capsule builders
+# Outline Pane
 # ---------------------------------------------------------------------------
 
-def _clean_for_capsule(s: str) -> str:
-    s = s.replace("```", "ʼʼʼ")
-    s = re.sub(r"\s+\n", "\n", s)
-    return s.strip()
-
-
-def build_context_capsule_for_snapshot(
-    *,
-    title: str,
-    url: str,
-    captured_at: str,
-    snippet: str,
-    body: str,
-    hard_cap_chars: int = 6500,
-) -> str:
-    title = _clean_for_capsule(title)
-    url = _clean_for_capsule(url)
-    snippet = _clean_for_capsule(snippet)
-    body = _clean_for_capsule(body)
-
-    max_body = max(0, min(5200, hard_cap_chars - 1000))
-    body_slice = body[:max_body]
-
-    header = (
-        f"### Context Capsule — ai_navigator\n"
-        f"Title: {title}\n"
-        f"URL: {url}\n"
-        f"Captured: {captured_at}\n"
-        f"---\n"
-    )
+def iter_outlines(path):
+    """
+    Stream an OPML file as ("body", None), ("open", attrs) and ("close", None)
+    events for the <outline> elements under <body>. Each element is cleared
+    once closed, so memory stays flat regardless of file size.
+    """
+    in_body = False
+    for event, el in ET.iterparse(path, events=("start", "end")):
+        tag = el.tag.rsplit("}", 1)[-1]
+        if tag == "body":
+            in_body = event == "start"
+            if in_body:
+                yield ("body", None)
+            continue
+        if not in_body or tag != "outline":
+            continue
+        if event == "start":
+            yield ("open", dict(el.attrib))
+        else:
+            yield ("close", None)
+            el.clear()
 
-    snippet_block = ""
-    if snippet:
-        snippet_block = f"**Snippet**\n{snippet}\n\n"
 
-    html_block = f"**Reader-Mode HTML (excerpt)**\n```html\n{body_slice}\n```\n"
+def read_outline(path):
+    """
+    Parse an OPML file into a list of (attrs, children) nodes, or None when it
+    has no <body>.
+    """
+    top = []
+    stack = []  # (attrs, children) for each open <outline>
+    saw_body = False
+    for kind, attrs in iter_outlines(path):
+        if kind == "body":
+            saw_body = True
+        elif kind == "open":
+            stack.append((attrs, []))
+        else:
+            node = stack.pop()
+            (stack[-1][1] if stack else top).append(node)
+    return top if saw_body else None
 
-    footer = (
-        "\nContinue from this capsule. Summarize key points from the page, "
-        "then propose the next 1–2 actions or questions. If anything is unclear, "
-        "ask for the single most relevant detail rather than restarting."
-    )
 
-    capsule = header + snippet_block + html_block + footer
-    if len(capsule) > hard_cap_chars:
-        capsule = capsule[: hard_cap_chars - 25] + "\n…[truncated]…"
-    return capsule
+def _outline_keys(attrs_list):
+    """
+    Stable per-sibling keys: the _local_id when there is one, otherwise the
+    text plus its occurrence count among same-text siblings.
+    """
+    seen = {}
+    keys = []
+    for attrs in attrs_list:
+        local_id = attrs.get("_local_id")
+        if local_id:
+            keys.append(("id", local_id))
+        else:
+            text = attrs.get("text", "")
+            n = seen.get(text, 0)
+            seen[text] = n + 1
+            keys.append(("text", text, n))
+    return keys
 
 
-def build_memory_weave_packet(
-    conn: sqlite3.Connection,
-    current_page_id: int,
-    k: int = 3,
-    hard_cap_chars: int = 7000,
-) -> str:
-    cur = conn.cursor()
+# Outline items are only built this many levels below the item being
+# created; deeper children wait on the item until it is first expanded.
+OUTLINE_EAGER_DEPTH = 2
+_OUTLINE_PENDING_ROLE = Qt.UserRole + 1
 
-    cur.execute(
-        "SELECT url, title, captured_at, snippet FROM archive_pages WHERE id = ?;",
-        (current_page_id,),
-    )
-    row = cur.fetchone()
-    if not row:
-        return build_global_weave_packet(conn, k=k, hard_cap_chars=hard_cap_chars)
 
-    sel_url, sel_title, sel_captured_at, sel_snippet = row
-    domain = urlparse(sel_url or "").netloc.lower()
+class _PendingOutline:
+    """Children not yet turned into items (kept opaque so Qt won't convert them)."""
 
-    items = []
+    __slots__ = ("nodes",)
 
-    if domain:
-        cur.execute(
-            """
-            SELECT id, title, url, captured_at, snippet
-            FROM archive_pages
-            WHERE url LIKE ?
-            ORDER BY captured_at DESC
-            LIMIT ?;
-            """,
-            (f"%://{domain}%", k),
-        )
-        items = cur.fetchall()
+    def __init__(self, nodes):
+        self.nodes = nodes
 
-    if len(items) < k:
-        have_ids = {r[0] for r in items}
-        need = k - len(items)
-        cur.execute(
-            """
-            SELECT id, title, url, captured_at, snippet
-            FROM archive_pages
-            ORDER BY captured_at DESC
-            LIMIT ?;
-            """,
-            (k * 3,),
+
+def _defer_outline_children(item: QTreeWidgetItem, children) -> None:
+    if children:
+        item.setData(0, _OUTLINE_PENDING_ROLE, _PendingOutline(children))
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+    else:
+        item.setData(0, _OUTLINE_PENDING_ROLE, None)
+        item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+
+def _outline_pending(item: QTreeWidgetItem):
+    pending = item.data(0, _OUTLINE_PENDING_ROLE)
+    return pending.nodes if pending is not None else None
+
+
+def _outline_item(node, depth: int = OUTLINE_EAGER_DEPTH) -> QTreeWidgetItem:
+    """
+    Build the item subtree for one node, `depth` levels deep, with an explicit
+    stack so arbitrarily deep outlines cost no Python recursion. Items at the
+    cut-off keep their children pending (see _expand_outline_item).
+    """
+    def make(attrs):
+        item = QTreeWidgetItem([attrs.get("text", "(untitled)")])
+        item.setData(0, Qt.UserRole, attrs)
+        return item
+
+    root = make(node[0])
+    stack = [(root, node[1], depth)]
+    while stack:
+        item, children, left = stack.pop()
+        if not children:
+            continue
+        if left <= 0:
+            _defer_outline_children(item, children)
+            continue
+        child_items = [make(attrs) for attrs, _ in children]
+        item.addChildren(child_items)
+        stack.extend(
+            (child, grandchildren, left - 1)
+            for child, (_, grandchildren) in zip(child_items, children)
         )
-        for r in cur.fetchall():
-            if r[0] not in have_ids:
-                items.append(r)
-                if len(items) >= k:
-                    break
-
-    header = "### Context Capsule — ai_navigator\n"
-    if domain:
-        header += f"Thread scope: {domain}\n"
-    header += f"Captured: {datetime.utcnow().isoformat(timespec='seconds')}Z\n---\n"
-
-    lines = []
-    for _id, title, url, ts, snip in items:
-        title = _clean_for_capsule(title or "(untitled)")
-        url = _clean_for_capsule(url or "")
-        ts = _clean_for_capsule(ts or "")
-        snip = _clean_for_capsule((snip or "")[:240])
-        lines.append(f"— {ts} · {title} · {url}")
-        if snip:
-            lines.append(f"   {snip}")
-
-    footer = (
-        "\n(End of memory weave)\n\n"
-        "Continue from these three context points. Summarize the through-line you infer, "
-        "then propose the next one or two actions."
-    )
+    return root
 
-    capsule = header + "\n".join(lines) + "\n" + footer
-    if len(capsule) > hard_cap_chars:
-        capsule = capsule[: hard_cap_chars - 25] + "\n…[truncated]…"
-    return capsule
 
+def _expand_outline_item(item: QTreeWidgetItem) -> None:
+    """itemExpanded handler: build one more level under a pending item."""
+    children = _outline_pending(item)
+    if children is None:
+        return
+    _defer_outline_children(item, None)
+    item.addChildren([_outline_item(node, depth=0) for node in children])
 
-def build_global_weave_packet(
-    conn: sqlite3.Connection, k: int = 3, hard_cap_chars: int = 7000
-) -> str:
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, title, url, captured_at, snippet
-        FROM archive_pages
-        ORDER BY captured_at DESC
-        LIMIT ?;
-        """,
-        (k,),
-    )
-    rows = cur.fetchall()
-
-    header = "### Context Capsule — ai_navigator\nThread scope: global\n"
-    header += f"Captured: {datetime.utcnow().isoformat(timespec='seconds')}Z\n---\n"
-
-    lines = []
-    for _id, title, url, ts, snip in rows:
-        title = _clean_for_capsule(title or "(untitled)")
-        url = _clean_for_capsule(url or "")
-        ts = _clean_for_capsule(ts or "")
-        snip = _clean_for_capsule((snip or "")[:240])
-        lines.append(f"— {ts} · {title} · {url}")
-        if snip:
-            lines.append(f"   {snip}")
-
-    footer = (
-        "\n(End of memory weave)\n\n"
-        "Continue from these three context points. Summarize the through-line you infer, "
-        "then propose the next one or two actions."
+
+def _merge_outline_children(root: QTreeWidgetItem, nodes) -> None:
+    """
+    Make root's subtree match `nodes`, reusing the existing item for every key
+    that survives (so its expansion state and subtree stay put) and only
+    creating items for new keys. Items whose key is gone are dropped.
+    Parents are worked off an explicit stack rather than by recursion.
+    """
+    stack = [(root, nodes)]
+    while stack:
+        parent, nodes = stack.pop()
+        _merge_level(parent, nodes, stack)
+
+
+def _merge_level(parent: QTreeWidgetItem, nodes, stack) -> None:
+    existing = [parent.child(i) for i in range(parent.childCount())]
+    old = dict(
+        zip(_outline_keys([it.data(0, Qt.UserRole) or {} for it in existing]), existing)
     )
 
-    capsule = header + "\n".join(lines) + "\n" + footer
-    if len(capsule) > hard_cap_chars:
-        capsule = capsule[: hard_cap_chars - 25] + "\n…[truncated]…"
-    return capsule
+    wanted = []
+    for key, node in zip(_outline_keys([n[0] for n in nodes]), nodes):
+        item = old.pop(key, None)
+        if item is None:
+            item = _outline_item(node)
+        else:
+            attrs, children = node
+            if item.data(0, Qt.UserRole) != attrs:
+                item.setText(0, attrs.get("text", "(untitled)"))
+                item.setData(0, Qt.UserRole, attrs)
+            if _outline_pending(item) is not None:
+                # Never expanded: swap in the new children, still unbuilt.
+                _defer_outline_children(item, children)
+            else:
+                stack.append((item, children))
+        wanted.append(item)
 
+    if len(wanted) != len(existing) or any(a is not b for a, b in zip(wanted, existing)):
+        # Taking items out of the view forgets which ones were expanded.
+        expanded = [it for top in wanted for it in _expanded_items(top)]
+        parent.takeChildren()
+        parent.addChildren(wanted)
+        for it in expanded:
+            it.setExpanded(True)
+
+
+def _expanded_items(item: QTreeWidgetItem):
+    stack = [item]
+    while stack:
+        it = stack.pop()
+        if it.isExpanded():
+            yield it
+        stack.extend(it.child(i) for i in range(it.childCount()))
 
-# ---------------------------------------------------------------------------
-# Outline Pane
-# ---------------------------------------------------------------------------
 
 class OutlinePane(QWidget):
     """
@@ -1225,6 +1719,9 @@ class OutlinePane(QWidget):
         self.db_path = db_path
         self.on_open_local = on_open_local
         self.opml_path = opml_path
+        self._opml_stamp = None  # (mtime_ns, size) of the file the tree shows
+        self._outline_loading = False
+        self._outline_reload_pending = False
 
         self.tree = QTreeWidget()
         self.tree.setHeaderHidden(True)
@@ -1262,39 +1759,73 @@ class OutlinePane(QWidget):
         self._populate_tree_from_opml()
 
         self.tree.itemActivated.connect(self._handle_activate)
+        self.tree.itemExpanded.connect(_expand_outline_item)
         self.reload_button.clicked.connect(self.reload_outline)
 
     def _populate_tree_from_opml(self):
-        self.tree.clear()
         try:
-            doc = ET.parse(self.opml_path)
-        except Exception as e:
-            warn_item = QTreeWidgetItem([f"(no outline loaded: {e})"])
-            self.tree.addTopLevelItem(warn_item)
+            st = os.stat(self.opml_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp is not None and stamp == self._opml_stamp:
+            # Unchanged on disk: the tree already shows this file, and the
+            # user's expand/collapse state stays as it is.
+            return
+        if self._outline_loading:
+            # Look again once the parse in flight has been applied.
+            self._outline_reload_pending = True
             return
+        # Parse off the GUI thread; only the tree update happens here.
+        self._outline_loading = True
+        run_in_pool(
+            read_outline,
+            self.opml_path,
+            on_done=lambda nodes: self._apply_outline(stamp, nodes),
+            on_error=self._outline_load_failed,
+        )
 
-        body = doc.getroot().find("./body")
-        if body is None:
-            self.tree.addTopLevelItem(QTreeWidgetItem(["(empty outline body)"]))
+    def _outline_load_finished(self):
+        self._outline_loading = False
+        if self._outline_reload_pending:
+            self._outline_reload_pending = False
+            self._populate_tree_from_opml()
+
+    def _outline_load_failed(self, msg: str):
+        self._opml_stamp = None
+        self._show_outline_placeholder(f"(no outline loaded: {msg})")
+        self._outline_load_finished()
+
+    def _apply_outline(self, stamp, nodes):
+        if nodes is None:
+            self._opml_stamp = None
+            self._show_outline_placeholder("(empty outline body)")
+            self._outline_load_finished()
             return
+        # Only a tree that came from a good load can be diffed; after an error
+        # the tree just holds a placeholder item.
+        merge = self._opml_stamp is not None
 
-        def add_outline_element(xml_el, parent_item=None):
-            if xml_el.tag != "outline":
-                return
-            text = xml_el.attrib.get("text", "(untitled)")
-            item = QTreeWidgetItem([text])
-            item.setData(0, Qt.UserRole, xml_el.attrib)
-            if parent_item is None:
-                self.tree.addTopLevelItem(item)
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            if merge:
+                # Touch only nodes whose key appeared or disappeared, keeping
+                # unchanged items (and whether they are expanded) as they are.
+                _merge_outline_children(self.tree.invisibleRootItem(), nodes)
             else:
-                parent_item.addChild(item)
-            for child in xml_el.findall("./outline"):
-                add_outline_element(child, item)
-
-        for top in body.findall("./outline"):
-            add_outline_element(top, None)
-
-        self.tree.expandToDepth(1)
+                self.tree.clear()
+                self.tree.insertTopLevelItems(0, [_outline_item(n) for n in nodes])
+                self.tree.expandToDepth(1)
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+        self._opml_stamp = stamp
+        self._outline_load_finished()
+
+    def _show_outline_placeholder(self, text: str):
+        self.tree.clear()
+        self.tree.addTopLevelItem(QTreeWidgetItem([text]))
 
     def reload_outline(self):
         self._populate_tree_from_opml()
@@ -1315,6 +1846,15 @@ class OutlinePane(QWidget):
 # ---------------------------------------------------------------------------
 # Memory Pane (Session → Domain → Page, Tree-Based — fixed)
 # ---------------------------------------------------------------------------
+def _sorted_slot(parent: QTreeWidgetItem, text: str, desc: bool) -> int:
+    """Index at which a child labelled `text` keeps parent's children sorted."""
+    for i in range(parent.childCount()):
+        other = parent.child(i).text(0)
+        if (text > other) if desc else (text < other):
+            return i
+    return parent.childCount()
+
+
 class MemoryPane(QWidget):
     """
     Memory Pane (Tree-Based):
@@ -1375,47 +1915,91 @@ class MemoryPane(QWidget):
     # ------------------------------------------------------------------
     # Render Memory Tree
     # ------------------------------------------------------------------
-    def refresh(self):
-        rows = load_memory_entries(self.db_path, limit=200)
-        self.tree.clear()
-
-        # sessions = { session_hour: { domain: [(mid,title,url,ts), ...] } }
-        sessions = {}
+    REFRESH_LIMIT = 200
 
-        for mid, url, title, ts in rows:
-            if not ts:
-                continue
-
-            # Normalize timestamps to the hour
-            try:
-                dt = datetime.fromisoformat(ts.replace("Z", ""))
-                session_key = dt.strftime("%Y-%m-%d %H:00")
-            except Exception:
-                session_key = "Unknown Session"
-
-            domain = urlparse(url).netloc or "unknown-domain"
-
-            sessions.setdefault(session_key, {})
-            sessions[session_key].setdefault(domain, [])
-            sessions[session_key][domain].append((mid, title or "(No title)", url, ts))
-
-        # Build display tree
-        for session_key in sorted(sessions.keys(), reverse=True):
+    def refresh(self):
+        """Full rebuild from the newest REFRESH_LIMIT entries (Refresh button)."""
+        rows = load_memory_entries(self.db_path, limit=self.REFRESH_LIMIT)
+        self._session_items = {}
+        self._domain_items = {}
+        self._last_seen_id = max((r[2] for r in rows), default=0)
+
+        # Rows arrive sorted by (session, domain); group them straight into
+        # items, each parent getting its children in one addChildren() call.
+        session_items = []
+        for session_key, session_rows in itertools.groupby(rows, key=itemgetter(0)):
             session_item = QTreeWidgetItem([session_key])
-            self.tree.addTopLevelItem(session_item)
+            self._session_items[session_key] = session_item
+            domain_items = []
 
-            for domain in sorted(sessions[session_key].keys()):
+            for domain, domain_rows in itertools.groupby(session_rows, key=itemgetter(1)):
                 domain_item = QTreeWidgetItem([domain])
-                session_item.addChild(domain_item)
+                self._domain_items[(session_key, domain)] = domain_item
+                domain_item.addChildren(self._page_items(domain_rows))
+                domain_items.append(domain_item)
 
-                for mid, title, url, ts in sessions[session_key][domain]:
-                    label = f"[{mid}] {title}"
-                    page_item = QTreeWidgetItem([label])
-                    page_item.setToolTip(0, url)
-                    domain_item.addChild(page_item)
+            session_item.addChildren(domain_items)
+            session_items.append(session_item)
 
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            self.tree.clear()
+            self.tree.addTopLevelItems(session_items)
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
         self.tree.expandToDepth(1)
 
+    def refresh_new(self):
+        """
+        Add only entries logged since the last load (MemoryWriter flushes).
+        New pages go on top of their domain; new sessions/domains are slotted
+        in at their sorted position. Existing items are left alone.
+        """
+        rows = load_memory_entries(
+            self.db_path, limit=self.REFRESH_LIMIT + 1, since_id=self._last_seen_id
+        )
+        if not rows:
+            return
+        if len(rows) > self.REFRESH_LIMIT:
+            self.refresh()
+            return
+        self._last_seen_id = max(self._last_seen_id, max(r[2] for r in rows))
+
+        root = self.tree.invisibleRootItem()
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for session_key, session_rows in itertools.groupby(rows, key=itemgetter(0)):
+                session_item = self._session_items.get(session_key)
+                if session_item is None:
+                    session_item = QTreeWidgetItem([session_key])
+                    self._session_items[session_key] = session_item
+                    root.insertChild(_sorted_slot(root, session_key, desc=True), session_item)
+                    session_item.setExpanded(True)
+
+                for domain, domain_rows in itertools.groupby(session_rows, key=itemgetter(1)):
+                    domain_item = self._domain_items.get((session_key, domain))
+                    if domain_item is None:
+                        domain_item = QTreeWidgetItem([domain])
+                        self._domain_items[(session_key, domain)] = domain_item
+                        session_item.insertChild(
+                            _sorted_slot(session_item, domain, desc=False), domain_item
+                        )
+                        domain_item.setExpanded(True)
+                    domain_item.insertChildren(0, self._page_items(domain_rows))
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    @staticmethod
+    def _page_items(rows):
+        items = []
+        for _s, _d, mid, title, url in rows:
+            page_item = QTreeWidgetItem([f"[{mid}] {title or '(No title)'}"])
+            page_item.setToolTip(0, url)
+            items.append(page_item)
+        return items
+
     def _handle_item_click(self, item, column):
         """When a leaf (page) is clicked, emit its URL for the browser to load."""
         url = item.toolTip(0)
@@ -1433,6 +2017,9 @@ class MainWindow(QWidget):
       BrowserPane | ResultsPane | OutlinePane | MemoryPane
     """
 
+    memoryFlushed = Signal()  # emitted from the MemoryWriter thread
+    archiveFlushed = Signal()  # emitted from the ArchiveWriter thread
+
     def __init__(self):
         super().__init__()
 
@@ -1455,6 +2042,12 @@ class MainWindow(QWidget):
         self.results_pane.recoveredPage.connect(self._handle_recovered_page)
         self.memory_pane.openUrlRequested.connect(self.browser_pane.load_from_memory)
 
+        # Memory rows land asynchronously; refresh the pane once a batch commits.
+        self.memoryFlushed.connect(self.memory_pane.refresh_new)
+        get_memory_writer(MEMORY_DB_PATH, on_flushed=self.memoryFlushed.emit)
+        self.archiveFlushed.connect(self.results_pane.refresh_all)
+        get_archive_writer(DB_PATH, on_flushed=self.archiveFlushed.emit)
+
         mid_splitter = QSplitter(Qt.Horizontal)
         mid_splitter.addWidget(self.results_pane)
         mid_splitter.addWidget(self.outline_pane)
@@ -1476,37 +2069,32 @@ class MainWindow(QWidget):
         pass
 
     def _handle_archive_request(self, url: str, title: str, html: str):
+        # Committed by ArchiveWriter; archiveFlushed refreshes the list.
         save_archive_page(DB_PATH, url, title, html)
-        self.results_pane.refresh_all()
         # After regenerating archive_export.opml externally,
         # hit "Reload" in OutlinePane to see new items.
 
     def _handle_memory_log(self, url: str, title: str, html: str):
         log_memory_entry(MEMORY_DB_PATH, url, title, html)
-        self.memory_pane.refresh()
 
     def _handle_recovered_page(self, html: str, url: str):
         self.browser_pane.load_html_snapshot(html, url)
 
     def _open_local_snapshot_by_id(self, row_id: int):
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT url, COALESCE(clean_html, html)
-            FROM archive_pages
-            WHERE id = ?;
-            """,
-            (row_id,),
+        run_in_pool(
+            _load_reader_snapshot,
+            DB_PATH,
+            row_id,
+            on_done=lambda result: self._local_snapshot_ready(row_id, result),
+            on_error=lambda msg: QMessageBox.critical(self, "Open snapshot failed", msg),
         )
-        row = cur.fetchone()
-        conn.close()
 
-        if not row:
+    def _local_snapshot_ready(self, row_id: int, result):
+        if result is None:
             QMessageBox.warning(self, "Not found", f"No snapshot with id {row_id}")
             return
 
-        url, html_for_reader = row
+        url, html_for_reader = result
         self.browser_pane.load_html_snapshot(html_for_reader, url or "about:blank")
 
 
@@ -1516,7 +2104,12 @@ class MainWindow(QWidget):
 
 def main():
     os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--no-sandbox")
+    # QtWebEngine is imported lazily (BrowserPane); it needs this set before
+    # the QApplication exists.
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    # Compress pre-zstd snapshots in the background; readers handle both forms.
+    threading.Thread(target=migrate_archive_html, args=(DB_PATH,), daemon=True).start()
     w = MainWindow()
     w.show()
     sys.exit(app.exec())
@@ -24,11 +24,24 @@ from typing import Optional, List, Dict
 
 from xml.sax.saxutils import escape as _xml_escape
 
+try:
+    import zstandard as zstd  # ai_navigator may store page HTML compressed
+except Exception:
+    zstd = None
+
+try:
+    # Headings are read straight off an lxml tree (no wrapper objects)
+    from lxml import etree
+    from lxml import html as lxml_html
+except Exception:
+    lxml_html = None  # BeautifulSoup fallback below
+
 try:
     # BeautifulSoup is available in your project; used to extract headings
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
 except Exception:
     BeautifulSoup = None
+    SoupStrainer = None
 
 log = logging.getLogger("aopmlengine")
 if not log.handlers:
@@ -125,11 +138,20 @@ class OPMLDocument:
 
 _HLEVEL = re.compile(r"^h([1-6])$", re.I)
 
+# Only heading nodes are materialized; the rest of the page is skipped by the parser.
+_HEADINGS_ONLY = (
+    SoupStrainer(["h1", "h2", "h3", "h4", "h5", "h6"]) if SoupStrainer else None
+)
+
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
 def _headings_from_html(html: str) -> List[tuple[int, str]]:
     """Return list of (level, text) for h1..h6 in order."""
+    if lxml_html is not None:
+        return _headings_lxml(html)
     if not html or not BeautifulSoup:
         return []
-    soup = BeautifulSoup(html, "lxml")
+    soup = BeautifulSoup(html, "lxml", parse_only=_HEADINGS_ONLY)
     out: List[tuple[int, str]] = []
     for tag in soup.find_all(re.compile(r"h[1-6]", re.I)):
         name = tag.name or ""
@@ -142,6 +164,26 @@ def _headings_from_html(html: str) -> List[tuple[int, str]]:
             out.append((lvl, text))
     return out
 
+if lxml_html is not None:
+    _HEADING_TEXT = etree.XPath(
+        ".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+    )
+
+def _headings_lxml(html: str) -> List[tuple[int, str]]:
+    # Same text as get_text(" ", strip=True): stripped text nodes, space-joined.
+    if not html or not html.strip():
+        return []
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return []
+    out: List[tuple[int, str]] = []
+    for el in root.iter(*_HEADING_TAGS):
+        text = " ".join(t for t in (s.strip() for s in _HEADING_TEXT(el)) if t)
+        if text:
+            out.append((int(el.tag[1]), text))
+    return out
+
 def _attach_headings(parent: Outline, html: str) -> None:
     nodes = _headings_from_html(html)
     if not nodes:
@@ -160,6 +202,15 @@ def _attach_headings(parent: Outline, html: str) -> None:
 
 # ---------------- DB → OPML ----------------
 
+def _unpack_html(text: Optional[str], blob: Optional[bytes]) -> Optional[str]:
+    """One (TEXT, *_zstd BLOB) column pair from archive_pages."""
+    if blob is None:
+        return text
+    if zstd is None:
+        log.warning("Skipping zstd-compressed HTML (zstandard not installed)")
+        return None
+    return zstd.ZstdDecompressor().decompress(blob).decode("utf-8")
+
 def export_archive_to_opml(
     db_path: str = "storage/search_time_machine.db",
     out_path: str = "archive_export.opml",
@@ -176,6 +227,8 @@ def export_archive_to_opml(
       snippet TEXT
       html TEXT
       clean_html TEXT
+      html_zstd BLOB         (optional, zstd-compressed html)
+      clean_html_zstd BLOB   (optional, zstd-compressed clean_html)
     """
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"DB not found: {db_path}")
@@ -184,10 +237,13 @@ def export_archive_to_opml(
 
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
+    cols = {r[1] for r in cur.execute("PRAGMA table_info(archive_pages)")}
+    packed = "html_zstd" in cols and "clean_html_zstd" in cols
     cur.execute(
-        """
+        f"""
         SELECT id, url, COALESCE(title, ''), COALESCE(captured_at, ''), COALESCE(snippet, ''),
-               COALESCE(clean_html, html, '')
+               clean_html, {"clean_html_zstd" if packed else "NULL"},
+               html, {"html_zstd" if packed else "NULL"}
         FROM archive_pages
         ORDER BY captured_at DESC, id DESC
         """
@@ -196,7 +252,9 @@ def export_archive_to_opml(
     conn.close()
 
     for row in rows:
-        pid, url, title, captured_at, snippet, body = row
+        pid, url, title, captured_at, snippet = row[:5]
+        clean = _unpack_html(row[5], row[6])
+        body = (clean if clean is not None else _unpack_html(row[7], row[8])) or ""
         title = title or url or "(untitled)"
 
         top = Outline(
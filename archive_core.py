@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+# archive_core.py
+#
+# Qt-free archive helpers shared by ai_navigator.py, navigator_rpc.py and the
+# crawler: captured-page parsing (snippet + Reader Mode HTML), zstd column
+# packing, connection setup, and the Context Capsule / Memory Weave builders.
+# Schema creation and url_domain() live in init_db.py.
+
+from __future__ import annotations
+
+import atexit
+import codecs
+import io
+import itertools
+import re
+import sqlite3
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+from init_db import ensure_archive_table, url_domain
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except Exception:
+    lxml_html = None  # HTMLParser / regex fallbacks below
+
+try:
+    import zstandard as zstd  # optional: compressed HTML storage
+except Exception:
+    zstd = None
+
+# ---------------------------------------------------------------------------
+# Timestamps
+# ---------------------------------------------------------------------------
+
+_last_sec = [0, ""]  # [epoch second, formatted string]
+
+
+def iso_now() -> str:
+    """
+    UTC "YYYY-MM-DDTHH:MM:SSZ" for now (what the tables have always stored),
+    formatted at most once per second.
+    """
+    s = int(time.time())
+    if s != _last_sec[0]:
+        _last_sec[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+        _last_sec[0] = s
+    return _last_sec[1]
+
+
+# ---------------------------------------------------------------------------
+# Captured pages: snippet, Reader Mode, zstd columns
+# ---------------------------------------------------------------------------
+
+# <script>/<iframe> blocks are cut with two literal searches per block rather
+# than a lazy ".*?" regex: with an unclosed tag the regex rescans the rest of
+# the page from every later opener (quadratic), the literal scan stops once.
+_SCRIPT_OPEN_RE = re.compile(r"<script", re.IGNORECASE)
+_SCRIPT_CLOSE_RE = re.compile(r"</script>", re.IGNORECASE)
+_IFRAME_OPEN_RE = re.compile(r"<iframe", re.IGNORECASE)
+_IFRAME_CLOSE_RE = re.compile(r"</iframe>", re.IGNORECASE)
+_PRELOAD_LINK_RE = re.compile(
+    r"<link[^>]+rel=[\"']?(preload|dns-prefetch|preconnect|modulepreload)[\"']?[^>]*>",
+    re.IGNORECASE,
+)
+_INLINE_HANDLER_RE = re.compile(
+    r"\son\w+\s*=\s*['\"].*?['\"]", re.IGNORECASE | re.DOTALL
+)
+
+
+class _SnippetDone(Exception):
+    """Raised by _SnippetExtractor once it has collected enough text."""
+
+
+class _SnippetExtractor(HTMLParser):
+    """
+    Streaming text collector: skips <script>/<style> bodies, collapses
+    whitespace per text run, and bails out as soon as `limit` chars are in.
+    """
+
+    _SKIP = frozenset(("script", "style"))
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.skip = 0
+        self.buf = []
+        self.total = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self.skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self.skip:
+            self.skip -= 1
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        chunk = " ".join(data.split())
+        if chunk:
+            self.buf.append(chunk)
+            self.total += len(chunk) + 1
+            if self.total > self.limit:
+                raise _SnippetDone
+
+
+def html_to_snippet(html: str, max_len: int = 500) -> str:
+    """
+    Tiny text extractor for preview/snippet:
+    - strips <script> and <style>
+    - strips other tags
+    - collapses whitespace
+    Returns first max_len chars. Parsing stops once max_len chars are
+    collected, so large pages only cost as much as their first screenful.
+    """
+    parser = _SnippetExtractor(max_len)
+    try:
+        parser.feed(html or "")
+        parser.close()
+    except _SnippetDone:
+        pass
+    return " ".join(parser.buf)[:max_len]
+
+
+def _strip_blocks(html: str, open_re, close_re) -> str:
+    """
+    Remove every open_re ... close_re span (first closer wins, like a lazy
+    regex). An opener without a closer, and everything after it, is kept.
+    """
+    out = []
+    pos = 0
+    while True:
+        m = open_re.search(html, pos)
+        if m is None:
+            break
+        end = close_re.search(html, m.end())
+        if end is None:
+            break
+        out.append(html[pos:m.start()])
+        pos = end.end()
+    if not out:
+        return html
+    out.append(html[pos:])
+    return "".join(out)
+
+
+def sanitize_html_for_reader(raw_html: str) -> str:
+    """
+    Reader Mode: preserves narrative, removes instrumentation.
+    We strip:
+      - <script>...</script>
+      - <iframe>...</iframe>
+      - preload / preconnect / dns-prefetch link tags
+      - inline JS event handlers like onclick="..."
+    """
+    cleaned = _strip_blocks(raw_html, _SCRIPT_OPEN_RE, _SCRIPT_CLOSE_RE)
+    cleaned = _strip_blocks(cleaned, _IFRAME_OPEN_RE, _IFRAME_CLOSE_RE)
+    cleaned = _PRELOAD_LINK_RE.sub("", cleaned)
+    cleaned = _INLINE_HANDLER_RE.sub("", cleaned)
+    return cleaned
+
+
+# Single-parse path: one lxml tree feeds the snippet, Reader Mode HTML and
+# the OPML heading walk. The regex helpers above are the fallback for input
+# lxml refuses to parse.
+
+_PRELOAD_RELS = frozenset(("preload", "dns-prefetch", "preconnect", "modulepreload"))
+if lxml_html is not None:
+    _VISIBLE_TEXT = etree.XPath("//text()[not(ancestor::script or ancestor::style)]")
+
+
+def parse_html(html):
+    """
+    Parse a page into an lxml document, or None if lxml rejects it (or is
+    not installed).
+    `html` may be str or UTF-8 bytes; bytes are lxml's native input and skip
+    the str -> UTF-8 round trip inside libxml2.
+    """
+    if lxml_html is None or not html or html.isspace():
+        return None
+    if isinstance(html, bytes):
+        try:
+            return lxml_html.document_fromstring(
+                html, parser=lxml_html.HTMLParser(encoding="utf-8")
+            )
+        except (etree.ParserError, ValueError):
+            return None
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # str input carrying an <?xml encoding=...?> declaration
+        try:
+            return lxml_html.document_fromstring(html.encode("utf-8"))
+        except (etree.ParserError, ValueError):
+            return None
+    except etree.ParserError:
+        return None
+
+
+def _snippet_from_tree(tree, max_len: int = 500) -> str:
+    parts = []
+    total = 0
+    for text in _VISIBLE_TEXT(tree):
+        chunk = " ".join(text.split())
+        if chunk:
+            parts.append(chunk)
+            total += len(chunk) + 1
+            if total > max_len:
+                break
+    return " ".join(parts)[:max_len]
+
+
+def _clean_from_tree(tree, keep_doctype: bool = True, encoding: str = "unicode"):
+    """
+    Reader Mode on a parsed tree (mutates it); mirrors sanitize_html_for_reader.
+    encoding="utf-8" serializes straight to bytes.
+    """
+    for el in list(tree.iter("script", "iframe")):
+        el.drop_tree()
+    for el in list(tree.iter("link")):
+        if _PRELOAD_RELS.intersection((el.get("rel") or "").lower().split()):
+            el.drop_tree()
+    for el in tree.iter(etree.Element):
+        for k in [k for k in el.attrib if k.lower().startswith("on")]:
+            del el.attrib[k]
+    body = lxml_html.tostring(tree, encoding=encoding)
+    # libxml2 invents an HTML 4 doctype when the page had none; only keep a real one.
+    doctype = tree.getroottree().docinfo.doctype if keep_doctype else ""
+    if not doctype:
+        return body
+    if isinstance(body, bytes):
+        return doctype.encode("utf-8") + b"\n" + body
+    return f"{doctype}\n{body}"
+
+
+_DOCTYPE_RE = re.compile(r"\s*<!doctype", re.IGNORECASE)
+_DOCTYPE_BYTES_RE = re.compile(rb"\s*<!doctype", re.IGNORECASE)
+
+
+def parse_and_clean(html) -> tuple:
+    """
+    (snippet, clean_html) from a single parse of `html`. For UTF-8 bytes
+    input clean_html comes back as bytes too, ready for pack_html.
+    """
+    as_bytes = isinstance(html, bytes)
+    tree = parse_html(html)
+    if tree is None:
+        text = html.decode("utf-8", "replace") if as_bytes else (html or "")
+        clean = sanitize_html_for_reader(text)
+        return html_to_snippet(text), clean.encode("utf-8") if as_bytes else clean
+    snippet = _snippet_from_tree(tree)
+    has_doctype = (_DOCTYPE_BYTES_RE if as_bytes else _DOCTYPE_RE).match(html) is not None
+    return snippet, _clean_from_tree(
+        tree, keep_doctype=has_doctype, encoding="utf-8" if as_bytes else "unicode"
+    )
+
+
+# Compressed HTML storage: html / clean_html go into *_zstd BLOB columns when
+# zstandard is installed. Readers must go through unpack_html/reader_html.
+
+ARCHIVE_ZSTD_LEVEL = 3
+
+# Column order for "COALESCE(clean_html, html)"-style reads via reader_html().
+READER_HTML_COLS = "clean_html, clean_html_zstd, html, html_zstd"
+
+
+def pack_html(html):
+    """(text, blob) for an HTML column and its *_zstd twin; str or UTF-8 bytes in."""
+    if html is None:
+        return None, None
+    if zstd is None:
+        return (html.decode("utf-8", "replace") if isinstance(html, bytes) else html), None
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    return None, zstd.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL).compress(html)
+
+
+def unpack_html(text, blob):
+    if blob is None:
+        return text
+    if zstd is None:
+        raise RuntimeError("snapshot is zstd-compressed; install zstandard")
+    return zstd.ZstdDecompressor().decompress(blob).decode("utf-8")
+
+
+def reader_html(clean_html, clean_html_zstd, html, html_zstd):
+    """COALESCE(clean_html, html) over the packed column pairs."""
+    clean = unpack_html(clean_html, clean_html_zstd)
+    return clean if clean is not None else unpack_html(html, html_zstd)
+
+
+# Prefix reads for callers that only need the start of a page (capsules):
+# TEXT columns are cut by substr() in SQL; for zstd columns only a "packed"
+# flag is selected and the blob is then read incrementally (blobopen), so just
+# the compressed bytes needed for the prefix leave the database.
+# Bind ?1 = id, ?2 = max chars.
+READER_HTML_PREFIX_COLS = (
+    "substr(clean_html, 1, ?2), clean_html_zstd IS NOT NULL, "
+    "substr(html, 1, ?2), html_zstd IS NOT NULL"
+)
+
+
+def _open_html_blob(conn: sqlite3.Connection, column: str, page_id: int):
+    """File-like reader over archive_pages.<column> for row page_id."""
+    if hasattr(conn, "blobopen"):  # Python 3.11+
+        return conn.blobopen("archive_pages", column, page_id, readonly=True)
+    row = conn.execute(f"SELECT {column} FROM archive_pages WHERE id = ?;", (page_id,))
+    return io.BytesIO(row.fetchone()[0])
+
+
+def _unpack_html_prefix(conn, page_id: int, column: str, text, packed, limit: int):
+    if not packed:
+        return text
+    if zstd is None:
+        raise RuntimeError("snapshot is zstd-compressed; install zstandard")
+    want = limit * 4  # UTF-8 needs at most 4 bytes per char
+    with _open_html_blob(conn, column, page_id) as blob:
+        reader = zstd.ZstdDecompressor().stream_reader(blob)
+        chunks = []
+        got = 0
+        while got < want:
+            chunk = reader.read(want - got)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            got += len(chunk)
+    # Incremental decode holds back a multi-byte char split at the cut.
+    return codecs.getincrementaldecoder("utf-8")().decode(b"".join(chunks))[:limit]
+
+
+def reader_html_prefix(
+    conn, page_id: int, clean_html, clean_packed, html, html_packed, limit: int
+):
+    """First `limit` chars of reader_html() for a row of READER_HTML_PREFIX_COLS."""
+    clean = _unpack_html_prefix(
+        conn, page_id, "clean_html_zstd", clean_html, clean_packed, limit
+    )
+    if clean is not None:
+        return clean
+    return _unpack_html_prefix(conn, page_id, "html_zstd", html, html_packed, limit)
+
+
+def archive_row(url, title, captured_at, snippet, clean_html, html) -> tuple:
+    """Row for SQL_ARCHIVE_INSERT with both HTML columns packed."""
+    return (
+        url,
+        url_domain(url),
+        title,
+        captured_at,
+        snippet,
+        *pack_html(clean_html),
+        *pack_html(html),
+    )
+
+
+def captured_row(url, title, captured_at, html: str) -> tuple:
+    """
+    archive_row for a freshly captured page. The page is encoded to UTF-8
+    once; parsing, cleaning and compression all work on those bytes, so the
+    page is never decoded back into a str on the way to the BLOB columns.
+    """
+    data = html.encode("utf-8", "replace") if html is not None else None
+    return archive_row(url, title, captured_at, *parse_and_clean(data), data)
+
+
+SQL_ARCHIVE_INSERT = """
+    INSERT INTO archive_pages
+        (url, domain, title, captured_at, snippet,
+         clean_html, clean_html_zstd, html, html_zstd)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Connections
+# ---------------------------------------------------------------------------
+
+_archive_conns: dict = {}
+
+
+def get_archive_conn(db_path: Path) -> sqlite3.Connection:
+    """
+    Shared, lazily opened archive connection (one per db_path).
+    Autocommit mode (isolation_level=None) so callers manage BEGIN/COMMIT;
+    the schema check runs once here instead of on every write. Opened with
+    check_same_thread=False; callers writing from several threads serialize
+    their transactions themselves.
+    """
+    conn = _archive_conns.get(db_path)
+    if conn is None:
+        ensure_archive_table(db_path)
+        conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.create_function("url_domain", 1, url_domain, deterministic=True)
+        atexit.register(conn.close)
+        _archive_conns[db_path] = conn
+    return conn
+
+
+ARCHIVE_BULK_BATCH = 1000  # rows per transaction for bulk imports
+
+
+def save_archive_pages_bulk(db_path: Path, pages, batch_size: int = ARCHIVE_BULK_BATCH) -> int:
+    """
+    Bulk variant of save_archive_page for crawls / imports. `pages` is an
+    iterable of (url, title, captured_at, html), the same items ArchiveWriter
+    takes. Rows are written with executemany, one transaction per
+    `batch_size` rows. Returns rows written.
+    """
+    conn = get_archive_conn(db_path)
+    rows_iter = (captured_row(*page) for page in pages)
+    written = 0
+    while True:
+        rows = list(itertools.islice(rows_iter, batch_size))
+        if not rows:
+            break
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(SQL_ARCHIVE_INSERT, rows)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        written += len(rows)
+    return written
+
+
+# Read-side tuning: temp b-trees in RAM, ~20 MB page cache, 256 MB mmap.
+READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def tune_read_conn(conn: sqlite3.Connection) -> sqlite3.Connection:
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+    conn.create_function("url_domain", 1, url_domain, deterministic=True)
+    return conn
+
+
+# ---------------------------------------------------------------------------
+# Capsule builders
+# ---------------------------------------------------------------------------
+
+_WS_NL_RE = re.compile(r"\s+\n")
+
+
+def clean_for_capsule(s: str) -> str:
+    s = (s or "").replace("```", "ʼʼʼ")
+    if "\n" in s:  # single-line fields (titles, urls) skip the regex
+        s = _WS_NL_RE.sub("\n", s)
+    return s.strip()
+
+
+CAPSULE_BODY_CHARS = 5200  # max Reader-Mode excerpt in a context capsule
+
+_CAPSULE_FOOTER = (
+    "\nContinue from this capsule. Summarize key points from the page, "
+    "then propose the next 1–2 actions or questions. If anything is unclear, "
+    "ask for the single most relevant detail rather than restarting."
+)
+
+_WEAVE_FOOTER = (
+    "\n(End of memory weave)\n\n"
+    "Continue from these three context points. Summarize the through-line you infer, "
+    "then propose the next one or two actions."
+)
+
+
+def _join_capped(parts, hard_cap_chars: int) -> str:
+    """
+    "".join(parts), cut to hard_cap_chars - 25 chars plus a truncation
+    marker when it would exceed hard_cap_chars. Only the pieces that fit are
+    copied, so an oversized capsule is never materialized in full.
+    """
+    keep = hard_cap_chars - 25
+    if sum(map(len, parts)) <= hard_cap_chars or keep <= 0:
+        capsule = "".join(parts)
+        if len(capsule) > hard_cap_chars:
+            capsule = capsule[:keep] + "\n…[truncated]…"
+        return capsule
+    out = []
+    for piece in parts:
+        if len(piece) >= keep:
+            out.append(piece[:keep])
+            break
+        out.append(piece)
+        keep -= len(piece)
+    out.append("\n…[truncated]…")
+    return "".join(out)
+
+
+def _append_weave_items(parts: list, items) -> None:
+    """One "— ts · title · url" line (+ indented snippet) per weave item."""
+    if not items:
+        parts.append("\n")
+        return
+    # Items come from _SQL_WEAVE_ITEMS with NULLs already replaced and the
+    # snippet already cut to 240 chars.
+    for _id, title, url, ts, snip in items:
+        title = clean_for_capsule(title)
+        url = clean_for_capsule(url)
+        ts = clean_for_capsule(ts)
+        snip = clean_for_capsule(snip)
+        parts.append(f"— {ts} · {title} · {url}\n")
+        if snip:
+            parts.append(f"   {snip}\n")
+
+
+def build_context_capsule_for_snapshot(
+    *,
+    title: str,
+    url: str,
+    captured_at: str,
+    snippet: str,
+    body: str,
+    hard_cap_chars: int = 6500,
+) -> str:
+    """
+    Only the first CAPSULE_BODY_CHARS chars of the cleaned body are used, so
+    callers reading it from the archive should fetch a prefix
+    (READER_HTML_PREFIX_COLS), not the whole page.
+    """
+    title = clean_for_capsule(title)
+    url = clean_for_capsule(url)
+    snippet = clean_for_capsule(snippet)
+    body = clean_for_capsule(body)
+
+    max_body = max(0, min(CAPSULE_BODY_CHARS, hard_cap_chars - 1000))
+
+    parts = [
+        "### Context Capsule — ai_navigator\n",
+        f"Title: {title}\n",
+        f"URL: {url}\n",
+        f"Captured: {captured_at}\n",
+        "---\n",
+    ]
+    if snippet:
+        parts += ("**Snippet**\n", snippet, "\n\n")
+    parts += (
+        "**Reader-Mode HTML (excerpt)**\n```html\n",
+        body[:max_body],
+        "\n```\n",
+        _CAPSULE_FOOTER,
+    )
+
+    return _join_capped(parts, hard_cap_chars)
+
+
+# Weave SQL is kept constant so reused connections hit sqlite3's statement
+# cache instead of re-preparing on every Recover. One round trip: the scope
+# row is the selected page's domain ('' for global / unknown ids), then
+# same-domain pages first (bucket 0) and the most recent of the rest; each
+# arm is capped by its own index scan before the merge. Every row carries the
+# scope domain in column 0; the LEFT JOIN keeps a single all-NULL item row
+# when there are no pages.
+# The scope is recomputed from url via url_domain() (registered by
+# tune_read_conn): the domain column was added after the HTML columns, so
+# reading it by id walks the page's overflow chain. For the same reason the
+# global arm tests the scope first: with no scope it never reads domain, and
+# rows whose domain is still NULL are not dropped.
+_SQL_WEAVE_ITEMS = """
+    WITH scope(d) AS (
+        SELECT COALESCE((SELECT url_domain(url) FROM archive_pages WHERE id = ?1), '')
+    )
+    SELECT
+        scope.d,
+        id,
+        COALESCE(NULLIF(title, ''), '(untitled)'),
+        COALESCE(url, ''),
+        COALESCE(captured_at, ''),
+        substr(COALESCE(snippet, ''), 1, 240)
+    FROM scope LEFT JOIN (
+        SELECT * FROM (
+            SELECT id, title, url, captured_at, snippet, 0 AS bucket
+            FROM archive_pages
+            WHERE domain = (SELECT d FROM scope WHERE d <> '')
+            ORDER BY captured_at DESC
+            LIMIT ?2
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT id, title, url, captured_at, snippet, 1 AS bucket
+            FROM archive_pages
+            WHERE (SELECT d FROM scope WHERE d <> '') IS NULL
+               OR domain IS NOT (SELECT d FROM scope WHERE d <> '')
+            ORDER BY captured_at DESC
+            LIMIT ?2
+        )
+        ORDER BY bucket, captured_at DESC
+        LIMIT ?2
+    )
+    ORDER BY bucket, captured_at DESC;
+"""
+
+
+def _build_weave(
+    conn: sqlite3.Connection,
+    *,
+    page_id: int | None = None,
+    k: int = 3,
+    hard_cap_chars: int = 7000,
+) -> str:
+    """
+    Weave of the k most recent pages, preferring page_id's domain when given.
+    `conn` needs the url_domain SQL function (tune_read_conn, get_archive_conn).
+    """
+    rows = conn.execute(_SQL_WEAVE_ITEMS, (page_id, k)).fetchall()
+    domain = rows[0][0]
+    items = [row[1:] for row in rows if row[1] is not None]
+
+    parts = [
+        "### Context Capsule — ai_navigator\n",
+        f"Thread scope: {domain or 'global'}\n",
+        f"Captured: {iso_now()}\n---\n",
+    ]
+    _append_weave_items(parts, items)
+    parts.append(_WEAVE_FOOTER)
+
+    return _join_capped(parts, hard_cap_chars)
+
+
+def build_memory_weave_packet(
+    conn: sqlite3.Connection,
+    current_page_id: int,
+    k: int = 3,
+    hard_cap_chars: int = 7000,
+) -> str:
+    return _build_weave(conn, page_id=current_page_id, k=k, hard_cap_chars=hard_cap_chars)
+
+
+def build_global_weave_packet(
+    conn: sqlite3.Connection, k: int = 3, hard_cap_chars: int = 7000
+) -> str:
+    return _build_weave(conn, k=k, hard_cap_chars=hard_cap_chars)
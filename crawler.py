@@ -1,12 +1,16 @@
 import requests
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 import sqlite3
 from pathlib import Path
 
 DB_PATH = Path("search_time_machine.db")
 
+# Parse only the tags each helper reads; lxml skips building the rest.
+_TITLE_ONLY = SoupStrainer(["title", "h1"])
+_LINKS_ONLY = SoupStrainer("a", href=True)
+
 def fetch_html(url: str) -> str:
     # polite fake browser header; avoids some "bot go away" blocks
     headers = {
@@ -21,7 +25,7 @@ def fetch_html(url: str) -> str:
     return resp.text
 
 def extract_title(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml", parse_only=_TITLE_ONLY)
     if soup.title and soup.title.string:
         return soup.title.string.strip()
     # fallback: first h1, or URL later
@@ -31,7 +35,7 @@ def extract_title(html: str) -> str:
     return "Untitled"
 
 def extract_links(html: str, base_url: str) -> list[str]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml", parse_only=_LINKS_ONLY)
     links = []
     for a in soup.find_all("a", href=True):
         href = urljoin(base_url, a["href"])
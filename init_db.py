@@ -6,9 +6,11 @@
 
 from __future__ import annotations
 
+import functools
 import sqlite3
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
 
 # Default locations (keep in sync with ai_navigator.py)
 STORAGE_DIR = Path("storage")
@@ -28,6 +30,57 @@ def _connect(db_path: Path) -> sqlite3.Connection:
     conn.execute("PRAGMA foreign_keys = ON;")
     return conn
 
+@functools.lru_cache(maxsize=4096)
+def url_domain(url) -> str:
+    """archive_pages.domain value: lowercased netloc of url."""
+    return urlsplit(url or "").netloc.lower()
+
+# Full-text index over archive_pages.title/snippet/url. Shared by
+# ai_navigator.py and navigator_rpc.py so the triggers exist once.
+ARCHIVE_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS archive_fts
+    USING fts5(title, snippet, url, content='archive_pages', content_rowid='id');
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archive_fts_ai AFTER INSERT ON archive_pages BEGIN
+        INSERT INTO archive_fts (rowid, title, snippet, url)
+        VALUES (new.id, new.title, new.snippet, new.url);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archive_fts_ad AFTER DELETE ON archive_pages BEGIN
+        INSERT INTO archive_fts (archive_fts, rowid, title, snippet, url)
+        VALUES ('delete', old.id, old.title, old.snippet, old.url);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archive_fts_au
+    AFTER UPDATE OF title, snippet, url ON archive_pages BEGIN
+        INSERT INTO archive_fts (archive_fts, rowid, title, snippet, url)
+        VALUES ('delete', old.id, old.title, old.snippet, old.url);
+        INSERT INTO archive_fts (rowid, title, snippet, url)
+        VALUES (new.id, new.title, new.snippet, new.url);
+    END;
+    """,
+)
+
+def ensure_archive_fts(cur) -> None:
+    """
+    Full-text index over title/snippet/url (external content: only the
+    tokens are stored, not a second copy of the rows). Triggers keep it in
+    step with archive_pages; HTML-only updates don't touch it.
+    Built once from existing rows; skipped if SQLite lacks FTS5.
+    """
+    if cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'archive_fts';").fetchone():
+        return
+    try:
+        for ddl in ARCHIVE_FTS_DDL:
+            cur.execute(ddl)
+    except sqlite3.OperationalError:
+        return
+    cur.execute("INSERT INTO archive_fts (archive_fts) VALUES ('rebuild');")
+
 def _ensure_archive_table(conn: sqlite3.Connection) -> None:
     """
     Table: archive_pages
@@ -39,6 +92,9 @@ def _ensure_archive_table(conn: sqlite3.Connection) -> None:
       html          TEXT     -- raw HTML
       clean_html    TEXT     -- Reader-Mode sanitized HTML
       completeness  REAL     -- text/markup ratio (0..1)
+      html_zstd        BLOB  -- zstd-compressed html (html is NULL then)
+      clean_html_zstd  BLOB  -- zstd-compressed clean_html
+      domain        TEXT     -- lowercased netloc of url (Memory Weave lookups)
     """
     cur = conn.cursor()
     cur.execute(
@@ -55,28 +111,59 @@ def _ensure_archive_table(conn: sqlite3.Connection) -> None:
         );
         """
     )
-    # Migrations
-    try:
-        cur.execute("ALTER TABLE archive_pages ADD COLUMN clean_html TEXT;")
-    except sqlite3.OperationalError:
-        pass
-    try:
-        cur.execute("ALTER TABLE archive_pages ADD COLUMN completeness REAL;")
-    except sqlite3.OperationalError:
-        pass
+    # Migrations: add only the columns that are missing instead of letting
+    # ALTER TABLE fail on every run.
+    cols = {row[1] for row in cur.execute("PRAGMA table_info(archive_pages);")}
+    for name, decl in (
+        ("clean_html", "TEXT"),
+        ("completeness", "REAL"),
+        ("html_zstd", "BLOB"),
+        ("clean_html_zstd", "BLOB"),
+        ("domain", "TEXT"),
+    ):
+        if name not in cols:
+            cur.execute(f"ALTER TABLE archive_pages ADD COLUMN {name} {decl};")
 
     # Indices
+    # Covers the results list query; replaces idx_archive_pages_captured_at.
     cur.execute(
-        "CREATE INDEX IF NOT EXISTS idx_archive_pages_captured_at "
-        "ON archive_pages (captured_at DESC);"
+        "CREATE INDEX IF NOT EXISTS idx_archive_pages_captured_title "
+        "ON archive_pages (captured_at DESC, title);"
     )
+    cur.execute("DROP INDEX IF EXISTS idx_archive_pages_captured_at;")
     cur.execute(
         "CREATE INDEX IF NOT EXISTS idx_archive_pages_url "
         "ON archive_pages (url);"
     )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_archive_pages_domain_captured "
+        "ON archive_pages (domain, captured_at DESC);"
+    )
+
+    # Backfill domain for rows written before the column existed.
+    conn.create_function("url_domain", 1, url_domain, deterministic=True)
+    cur.execute("UPDATE archive_pages SET domain = url_domain(url) WHERE domain IS NULL;")
+    ensure_archive_fts(cur)
 
     conn.commit()
 
+_archive_schema_checked = set()  # db paths already brought up to date
+
+def ensure_archive_table(db_path: Path | str) -> None:
+    """
+    Bring archive_pages (columns, indexes, archive_fts) up to date at db_path.
+    Checked once per path per process; later calls return immediately.
+    """
+    key = str(db_path)
+    if key in _archive_schema_checked:
+        return
+    conn = _connect(Path(db_path))
+    try:
+        _ensure_archive_table(conn)
+    finally:
+        conn.close()
+    _archive_schema_checked.add(key)
+
 def _ensure_page_hash_table(conn: sqlite3.Connection) -> None:
     cur = conn.cursor()
     cur.execute(
@@ -1,6 +1,11 @@
+import time
 from collections import deque
 from urllib.parse import urlparse
 
+from archive_core import iso_now, save_archive_pages_bulk
+from crawler import DB_PATH, extract_links, extract_title, fetch_html
+from init_db import ensure_archive_table
+
 def crawl_and_archive(
     seeds,
     max_pages=20,
@@ -13,6 +18,10 @@ def crawl_and_archive(
     same_domain_only: if True, don't leave the first seed's domain
     allowed_keywords: list of lowercase substrings; if set, we only enqueue
                       links whose URL contains any of them
+
+    Pages are written with one save_archive_pages_bulk() call when the crawl
+    ends (or is interrupted) instead of one transaction per page.
+    Returns the number of pages archived.
     """
     ensure_archive_table(DB_PATH)
 
@@ -28,41 +37,43 @@ def crawl_and_archive(
     for s in seeds:
         queue.append((s, 0))  # (url, depth)
 
-    pages_archived = 0
-
-    while queue and pages_archived < max_pages:
-        url, depth = queue.popleft()
-        if url in visited:
-            continue
-        visited.add(url)
+    pages = []  # (url, title, captured_at, html) for the bulk insert
 
-        try:
-            html = fetch_html(url)
-        except Exception as e:
-            print(f"[skip] {url} ({e})")
-            continue
+    try:
+        while queue and len(pages) < max_pages:
+            url, depth = queue.popleft()
+            if url in visited:
+                continue
+            visited.add(url)
 
-        title = extract_title(html)
-        print(f"[archive] {url}  ->  {title!r}")
-        save_archive_page(DB_PATH, url, title, html)
-        pages_archived += 1
+            try:
+                html = fetch_html(url)
+            except Exception as e:
+                print(f"[skip] {url} ({e})")
+                continue
 
-        # link discovery
-        links = extract_links(html, url)
-        for link in links:
-            # normalize / filter
-            if same_domain_only and root_domain:
-                if urlparse(link).netloc != root_domain:
-                    continue
+            title = extract_title(html)
+            print(f"[archive] {url}  ->  {title!r}")
+            pages.append((url, title, iso_now(), html))
 
-            if allowed_keywords:
-                lowered = link.lower()
-                if not any(kw in lowered for kw in allowed_keywords):
-                    continue
+            # link discovery
+            links = extract_links(html, url)
+            for link in links:
+                # normalize / filter
+                if same_domain_only and root_domain:
+                    if urlparse(link).netloc != root_domain:
+                        continue
 
-            if link not in visited:
-                queue.append((link, depth + 1))
+                if allowed_keywords:
+                    lowered = link.lower()
+                    if not any(kw in lowered for kw in allowed_keywords):
+                        continue
 
-        # optional politeness delay (don't hammer)
-        time.sleep(0.5)
+                if link not in visited:
+                    queue.append((link, depth + 1))
 
+            # optional politeness delay (don't hammer)
+            time.sleep(0.5)
+    finally:
+        save_archive_pages_bulk(DB_PATH, pages)
+    return len(pages)
@@ -11,6 +11,7 @@ Methods:
   - version()
   - info()
   - list_snapshots(limit=100, offset=0, query=None)
+  - search_snapshots(query, limit=100, offset=0)   # FTS5 word-prefix search
   - get_snapshot(id)
   - get_snapshot_html(id, reader_mode=True)
   - context_capsule(id, hard_cap_chars=6500)
@@ -26,11 +27,13 @@ Run:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
+import queue
 import re
 import sqlite3
-from datetime import datetime
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, List
 
@@ -47,215 +50,69 @@ except Exception:
 
 from flask import Flask, request, jsonify
 
+# Shared with ai_navigator.py (both modules are Qt-free).
+from init_db import ensure_archive_table
+from archive_core import (
+    SQL_ARCHIVE_INSERT,
+    build_context_capsule_for_snapshot,
+    build_memory_weave_packet,
+    captured_row,
+    get_archive_conn,
+    iso_now,
+    reader_html,
+    tune_read_conn,
+    unpack_html,
+)
+
 # Keep in sync with ai_navigator.py
 DB_PATH = Path("storage") / "search_time_machine.db"
 DEFAULT_OPML_PATH = "archive_export.opml"
 
 
-# -------------------------- DB & HTML helpers --------------------------
-
-
-def ensure_archive_table(db_path: Path):
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS archive_pages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            url TEXT,
-            title TEXT,
-            captured_at TEXT,
-            snippet TEXT,
-            html TEXT,
-            clean_html TEXT
-        );
-        """
-    )
-    # tolerate existing clean_html
-    try:
-        cur.execute("ALTER TABLE archive_pages ADD COLUMN clean_html TEXT;")
-    except sqlite3.OperationalError:
-        pass
-    conn.commit()
-    conn.close()
+# -------------------------- DB helpers --------------------------
 
+# Page parsing, zstd packing and the capsule/weave builders are shared with
+# ai_navigator.py through archive_core; only Flask's connection handling is
+# specific to this service.
 
-def html_to_snippet(html: str, max_len: int = 500) -> str:
-    text = re.sub(r"<script.*?</script>", " ", html, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<style.*?</style>", " ", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    text = text.strip()
-    return text[:max_len]
+_archive_lock = threading.Lock()  # Flask may serve requests on several threads
+_read_pools: Dict[Path, "queue.SimpleQueue[sqlite3.Connection]"] = {}
 
 
-def sanitize_html_for_reader(raw_html: str) -> str:
-    cleaned = re.sub(
-        r"<script.*?</script>", "", raw_html, flags=re.IGNORECASE | re.DOTALL
-    )
-    cleaned = re.sub(
-        r"<iframe.*?</iframe>", "", cleaned, flags=re.IGNORECASE | re.DOTALL
-    )
-    cleaned = re.sub(
-        r"<link[^>]+rel=['\"]?(preload|dns-prefetch|preconnect|modulepreload)['\"]?[^>]*>",
-        "",
-        cleaned,
-        flags=re.IGNORECASE,
-    )
-    cleaned = re.sub(
-        r"\son\w+\s*=\s*['\"].*?['\"]", "", cleaned, flags=re.IGNORECASE | re.DOTALL
-    )
-    return cleaned
+@contextlib.contextmanager
+def archive_read_conn(db_path: Path = DB_PATH):
+    """
+    Borrow a pooled read connection. Flask's dev server runs each request on
+    a new thread, so per-thread connections would not outlive a request;
+    pooled ones keep their statement and page caches across requests.
+    """
+    pool = _read_pools.setdefault(db_path, queue.SimpleQueue())
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        ensure_archive_table(db_path)
+        conn = tune_read_conn(sqlite3.connect(db_path, check_same_thread=False))
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
 
 
 def save_archive_page(db_path: Path, url: str, title: str, html: str) -> int:
-    ensure_archive_table(db_path)
-    captured_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    snippet = html_to_snippet(html)
-    clean_html = sanitize_html_for_reader(html)
-
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO archive_pages (url, title, captured_at, snippet, html, clean_html)
-        VALUES (?, ?, ?, ?, ?, ?);
-        """,
-        (url, title, captured_at, snippet, html, clean_html),
-    )
-    rowid = cur.lastrowid
-    conn.commit()
-    conn.close()
+    # Same row as ai_navigator's ArchiveWriter, domain included.
+    row = captured_row(url, title, iso_now(), html)
+    with _archive_lock:
+        conn = get_archive_conn(db_path)
+        conn.execute("BEGIN")
+        try:
+            rowid = conn.execute(SQL_ARCHIVE_INSERT, row).lastrowid
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
     return int(rowid)
 
 
-def _clean_for_capsule(s: str) -> str:
-    s = (s or "").replace("```", "ʼʼʼ")
-    s = re.sub(r"\s+\n", "\n", s)
-    return s.strip()
-
-
-def build_context_capsule_for_snapshot(
-    *,
-    title: str,
-    url: str,
-    captured_at: str,
-    snippet: str,
-    body: str,
-    hard_cap_chars: int = 6500,
-) -> str:
-    title = _clean_for_capsule(title)
-    url = _clean_for_capsule(url)
-    snippet = _clean_for_capsule(snippet)
-    body = _clean_for_capsule(body)
-
-    max_body = max(0, min(5200, hard_cap_chars - 1000))
-    body_slice = body[:max_body]
-
-    header = (
-        f"### Context Capsule — ai_navigator\n"
-        f"Title: {title}\n"
-        f"URL: {url}\n"
-        f"Captured: {captured_at}\n"
-        f"---\n"
-    )
-    snippet_block = f"**Snippet**\n{snippet}\n\n" if snippet else ""
-    html_block = f"**Reader-Mode HTML (excerpt)**\n```html\n{body_slice}\n```\n"
-    footer = (
-        "\nContinue from this capsule. Summarize key points from the page, "
-        "then propose the next 1–2 actions or questions. If anything is unclear, "
-        "ask for the single most relevant detail rather than restarting."
-    )
-
-    capsule = header + snippet_block + html_block + footer
-    if len(capsule) > hard_cap_chars:
-        capsule = capsule[: hard_cap_chars - 25] + "\n…[truncated]…"
-    return capsule
-
-
-def build_memory_weave_packet(
-    conn: sqlite3.Connection,
-    current_page_id: Optional[int],
-    k: int = 3,
-    hard_cap_chars: int = 7000,
-) -> str:
-    cur = conn.cursor()
-
-    sel_url = None
-    if current_page_id is not None:
-        cur.execute(
-            "SELECT url FROM archive_pages WHERE id = ?;",
-            (current_page_id,),
-        )
-        row = cur.fetchone()
-        if row:
-            sel_url = (row[0] or "").strip()
-
-    from urllib.parse import urlparse
-
-    domain = (urlparse(sel_url).netloc.lower() if sel_url else "") if sel_url else ""
-
-    items: List[Tuple[int, str, str, str, str]] = []
-    if domain:
-        cur.execute(
-            """
-            SELECT id, title, url, captured_at, snippet
-            FROM archive_pages
-            WHERE url LIKE ?
-            ORDER BY captured_at DESC
-            LIMIT ?;
-            """,
-            (f"%://{domain}%", k),
-        )
-        items = cur.fetchall()
-
-    if len(items) < k:
-        have_ids = {r[0] for r in items}
-        need = k - len(items)
-        cur.execute(
-            """
-            SELECT id, title, url, captured_at, snippet
-            FROM archive_pages
-            ORDER BY captured_at DESC
-            LIMIT ?;
-            """,
-            (k * 3,),
-        )
-        for r in cur.fetchall():
-            if r[0] not in have_ids:
-                items.append(r)
-                if len(items) >= k:
-                    break
-
-    header = "### Context Capsule — ai_navigator\n"
-    if domain:
-        header += f"Thread scope: {domain}\n"
-    else:
-        header += "Thread scope: global\n"
-    header += f"Captured: {datetime.utcnow().isoformat(timespec='seconds')}Z\n---\n"
-
-    lines = []
-    for _id, title, url, ts, snip in items:
-        title = _clean_for_capsule(title or "(untitled)")
-        url = _clean_for_capsule(url or "")
-        ts = _clean_for_capsule(ts or "")
-        snip = _clean_for_capsule((snip or "")[:240])
-        lines.append(f"— {ts} · {title} · {url}")
-        if snip:
-            lines.append(f"   {snip}")
-
-    footer = (
-        "\n(End of memory weave)\n\n"
-        "Continue from these three context points. Summarize the through-line you infer, "
-        "then propose the next one or two actions."
-    )
-
-    capsule = header + "\n".join(lines) + "\n" + footer
-    if len(capsule) > hard_cap_chars:
-        capsule = capsule[: hard_cap_chars - 25] + "\n…[truncated]…"
-    return capsule
-
-
 # -------------------------- JSON-RPC plumbing --------------------------
 
 
@@ -267,6 +124,49 @@ class RPCError(Exception):
         self.data = data
 
 
+_FTS_TOKEN_RE = re.compile(r"\w+")
+
+_SQL_LIST_LIKE = """
+    SELECT id, title, url, captured_at, snippet
+    FROM archive_pages
+    WHERE title LIKE ? OR url LIKE ? OR snippet LIKE ?
+    ORDER BY captured_at DESC
+    LIMIT ? OFFSET ?;
+"""
+
+_SQL_LIST_RECENT = """
+    SELECT id, title, url, captured_at, snippet
+    FROM archive_pages
+    ORDER BY captured_at DESC
+    LIMIT ? OFFSET ?;
+"""
+
+_SQL_LIST_MATCH = """
+    SELECT id, title, url, captured_at, snippet
+    FROM archive_pages
+    WHERE id IN (SELECT rowid FROM archive_fts WHERE archive_fts MATCH ?)
+    ORDER BY captured_at DESC
+    LIMIT ? OFFSET ?;
+"""
+
+
+def _fts_query(query: str) -> str:
+    """FTS5 MATCH string: every word of `query` as a quoted prefix term (AND)."""
+    return " ".join(f'"{tok}"*' for tok in _FTS_TOKEN_RE.findall(query))
+
+
+def _execute_match(cur, query: str, limit: int, offset: int) -> bool:
+    """Run the archive_fts search; False if it can't be used (no words / no FTS5)."""
+    match = _fts_query(query)
+    if not match:
+        return False
+    try:
+        cur.execute(_SQL_LIST_MATCH, (match, limit, offset))
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
 class NavigatorRPC:
     def __init__(self, db_path: Path = DB_PATH, opml_path: str = DEFAULT_OPML_PATH):
         self.db_path = db_path
@@ -282,7 +182,7 @@ class NavigatorRPC:
         return {
             "rpc": "1.0",
             "service": "navigator_rpc",
-            "caps": ["archive", "opml", "capsule", "weave"],
+            "caps": ["archive", "opml", "capsule", "weave", "search"],
         }
 
     def info(self):
@@ -296,32 +196,38 @@ class NavigatorRPC:
     def list_snapshots(
         self, limit: int = 100, offset: int = 0, query: Optional[str] = None
     ):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        if query:
-            like = f"%{query}%"
-            cur.execute(
-                """
-                SELECT id, title, url, captured_at, snippet
-                FROM archive_pages
-                WHERE title LIKE ? OR url LIKE ? OR snippet LIKE ?
-                ORDER BY captured_at DESC
-                LIMIT ? OFFSET ?;
-                """,
-                (like, like, like, int(limit), int(offset)),
-            )
-        else:
-            cur.execute(
-                """
-                SELECT id, title, url, captured_at, snippet
-                FROM archive_pages
-                ORDER BY captured_at DESC
-                LIMIT ? OFFSET ?;
-                """,
-                (int(limit), int(offset)),
-            )
-        rows = cur.fetchall()
-        conn.close()
+        with archive_read_conn(self.db_path) as conn:
+            cur = conn.cursor()
+            if query:
+                like = f"%{query}%"
+                cur.execute(_SQL_LIST_LIKE, (like, like, like, int(limit), int(offset)))
+            else:
+                cur.execute(_SQL_LIST_RECENT, (int(limit), int(offset)))
+            rows = cur.fetchall()
+        return [
+            {
+                "id": r[0],
+                "title": r[1],
+                "url": r[2],
+                "captured_at": r[3],
+                "snippet": r[4],
+            }
+            for r in rows
+        ]
+
+    def search_snapshots(self, query: str, limit: int = 100, offset: int = 0):
+        """
+        Word search over title/snippet/url via archive_fts: every word of
+        `query` must start a token ("exam" finds "example", "ample" does not).
+        Falls back to list_snapshots' substring match without FTS5.
+        """
+        query = query or ""
+        with archive_read_conn(self.db_path) as conn:
+            cur = conn.cursor()
+            if not _execute_match(cur, query, int(limit), int(offset)):
+                like = f"%{query}%"
+                cur.execute(_SQL_LIST_LIKE, (like, like, like, int(limit), int(offset)))
+            rows = cur.fetchall()
         return [
             {
                 "id": r[0],
@@ -334,14 +240,11 @@ class NavigatorRPC:
         ]
 
     def get_snapshot(self, id: int):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT id, title, url, captured_at, snippet FROM archive_pages WHERE id = ?;",
-            (int(id),),
-        )
-        row = cur.fetchone()
-        conn.close()
+        with archive_read_conn(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT id, title, url, captured_at, snippet FROM archive_pages WHERE id = ?;",
+                (int(id),),
+            ).fetchone()
         if not row:
             raise RPCError(-32004, f"snapshot {id} not found")
         return {
@@ -353,37 +256,37 @@ class NavigatorRPC:
         }
 
     def get_snapshot_html(self, id: int, reader_mode: bool = True):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        if reader_mode:
-            cur.execute(
-                "SELECT COALESCE(clean_html, html) FROM archive_pages WHERE id = ?;",
-                (int(id),),
-            )
-        else:
-            cur.execute("SELECT html FROM archive_pages WHERE id = ?;", (int(id),))
-        row = cur.fetchone()
-        conn.close()
-        if not row or not row[0]:
+        with archive_read_conn(self.db_path) as conn:
+            if reader_mode:
+                row = conn.execute(
+                    "SELECT clean_html, clean_html_zstd, html, html_zstd "
+                    "FROM archive_pages WHERE id = ?;",
+                    (int(id),),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT html, html_zstd FROM archive_pages WHERE id = ?;", (int(id),)
+                ).fetchone()
+        html = (reader_html(*row) if reader_mode else unpack_html(*row)) if row else None
+        if not html:
             raise RPCError(-32004, f"snapshot {id} has no html")
-        return {"html": row[0]}
+        return {"html": html}
 
     def context_capsule(self, id: int, hard_cap_chars: int = 6500):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT title, url, captured_at, snippet, COALESCE(clean_html, html)
-            FROM archive_pages
-            WHERE id = ?;
-            """,
-            (int(id),),
-        )
-        row = cur.fetchone()
-        conn.close()
+        with archive_read_conn(self.db_path) as conn:
+            row = conn.execute(
+                """
+                SELECT title, url, captured_at, snippet,
+                       clean_html, clean_html_zstd, html, html_zstd
+                FROM archive_pages
+                WHERE id = ?;
+                """,
+                (int(id),),
+            ).fetchone()
         if not row:
             raise RPCError(-32004, f"snapshot {id} not found")
-        title, url, captured_at, snippet, body = row
+        title, url, captured_at, snippet = row[:4]
+        body = reader_html(*row[4:])
         capsule = build_context_capsule_for_snapshot(
             title=title or url or "(untitled)",
             url=url or "about:blank",
@@ -397,17 +300,14 @@ class NavigatorRPC:
     def memory_weave(
         self, id: Optional[int] = None, k: int = 3, hard_cap_chars: int = 7000
     ):
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with archive_read_conn(self.db_path) as conn:
             capsule = build_memory_weave_packet(
                 conn,
                 int(id) if id is not None else None,
                 k=int(k),
                 hard_cap_chars=int(hard_cap_chars),
             )
-            return {"capsule": capsule}
-        finally:
-            conn.close()
+        return {"capsule": capsule}
 
     def export_opml(self, owner_name: str = "Glen", out_path: str = DEFAULT_OPML_PATH):
         if not aopmlengine:
@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import zstandard as zstd
+except Exception:
+    zstd = None
+
+import extract_opml
+
+
+@unittest.skipIf(zstd is None, "zstandard not installed")
+class ExportZstdRowTest(unittest.TestCase):
+    def test_zstd_only_row_keeps_outline_children(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "archive.db")
+            out_path = os.path.join(tmp, "out.opml")
+            html = "<html><body><h1>Top</h1><p>x</p><h2>Sub</h2></body></html>"
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE archive_pages (id INTEGER PRIMARY KEY, url TEXT, title TEXT, "
+                "captured_at TEXT, snippet TEXT, html TEXT, clean_html TEXT, "
+                "html_zstd BLOB, clean_html_zstd BLOB)"
+            )
+            conn.execute(
+                "INSERT INTO archive_pages (url, title, captured_at, snippet, clean_html_zstd) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ("http://example.com/", "Page", "2025-01-01T00:00:00Z", "",
+                 zstd.ZstdCompressor().compress(html.encode("utf-8"))),
+            )
+            conn.commit()
+            conn.close()
+
+            extract_opml.export_archive_to_opml(db_path, out_path)
+
+            page = ET.parse(out_path).getroot().find("body/outline")
+            self.assertEqual(page.get("text"), "Page")
+            top = page.find("outline")
+            self.assertIsNotNone(top)
+            self.assertEqual(top.get("text"), "Top")
+            self.assertEqual(top.find("outline").get("text"), "Sub")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import minimal_crawler
+except ImportError:  # requests / bs4 missing
+    minimal_crawler = None
+
+SITE = {
+    "http://example.com/": '<html><head><title>Home</title></head><body>'
+                           '<a href="/a">a</a><a href="http://other.org/">x</a></body></html>',
+    "http://example.com/a": "<html><head><title>Page A</title></head><body><p>alpha</p></body></html>",
+}
+
+
+@unittest.skipIf(minimal_crawler is None, "crawler dependencies not installed")
+class CrawlAndArchiveTest(unittest.TestCase):
+    def test_crawl_writes_pages_in_bulk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "archive.db"
+            with mock.patch.object(minimal_crawler, "DB_PATH", db_path), \
+                 mock.patch.object(minimal_crawler, "fetch_html", SITE.__getitem__), \
+                 mock.patch.object(minimal_crawler.time, "sleep"), \
+                 mock.patch.object(minimal_crawler, "save_archive_pages_bulk",
+                                   wraps=minimal_crawler.save_archive_pages_bulk) as bulk:
+                archived = minimal_crawler.crawl_and_archive(["http://example.com/"])
+
+            self.assertEqual(archived, 2)
+            self.assertEqual(bulk.call_count, 1)
+            conn = sqlite3.connect(db_path)
+            rows = conn.execute(
+                "SELECT url, domain, title, snippet FROM archive_pages ORDER BY id"
+            ).fetchall()
+            conn.close()
+            self.assertEqual(rows, [
+                ("http://example.com/", "example.com", "Home", "Home a x"),
+                ("http://example.com/a", "example.com", "Page A", "Page A alpha"),
+            ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import navigator_rpc
+except ImportError:  # flask missing
+    navigator_rpc = None
+
+
+@unittest.skipIf(navigator_rpc is None, "flask not installed")
+class ArchiveRawDomainTest(unittest.TestCase):
+    def test_rpc_rows_get_domain_and_join_the_weave(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            svc = navigator_rpc.NavigatorRPC(Path(tmp) / "archive.db", "out.opml")
+            first = svc.archive_raw("https://Example.com/a", "First", "<p>alpha</p>")["id"]
+            svc.archive_raw("https://example.com/b", "Second", "<p>beta</p>")
+            svc.archive_raw("https://other.org/c", "Third", "<p>gamma</p>")
+
+            conn = sqlite3.connect(Path(tmp) / "archive.db")
+            domains = conn.execute("SELECT domain FROM archive_pages ORDER BY id").fetchall()
+            conn.close()
+            self.assertEqual(domains, [("example.com",), ("example.com",), ("other.org",)])
+
+            capsule = svc.memory_weave(first)["capsule"]
+            self.assertIn("Thread scope: example.com", capsule)
+            self.assertIn("Second", capsule)
+            self.assertIn("Third", capsule)
+
+
+if __name__ == "__main__":
+    unittest.main()